@@ -0,0 +1,66 @@
+"""
+Micro-benchmark cleaning stage: chain per-row lama vs clean_texts
+
+Usage:
+    python benchmarks/bench_cleaning.py
+    python benchmarks/bench_cleaning.py --repeat 50
+"""
+
+import argparse
+import re
+import string
+import sys
+import timeit
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.preprocessing import clean_texts
+import config
+
+
+def legacy_clean(text):
+    """Chain cleaning versi awal (re.sub + str.maketrans per teks)"""
+    text = str(text).lower()
+    text = re.sub(r'http\S+|www\.\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'@\w+', '', text)
+    text = re.sub(r'#\w+', '', text)
+    text = text.translate(str.maketrans('', '', string.punctuation))
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cleaning stage')
+    parser.add_argument('--repeat', type=int, default=20, help='Jumlah pengulangan')
+    args = parser.parse_args()
+
+    texts = pd.read_csv(config.RAW_DATA)['question']
+    n = len(texts)
+
+    # Hasil harus identik, termasuk kasus urutan pattern noise
+    edge_cases = pd.Series([
+        'foo.www.bar@baz', 'a@http://x b', '#tag http://x.com @user mail@x.com', None
+    ])
+    for sample in (texts, edge_cases):
+        assert sample.apply(legacy_clean).tolist() == clean_texts(sample).tolist()
+
+    legacy = min(timeit.repeat(lambda: texts.apply(legacy_clean), number=1, repeat=args.repeat))
+    batch_series = min(timeit.repeat(lambda: clean_texts(texts), number=1, repeat=args.repeat))
+    text_list = texts.tolist()
+    batch_list = min(timeit.repeat(lambda: clean_texts(text_list), number=1, repeat=args.repeat))
+
+    print(f"Texts: {n}, repeat: {args.repeat} (best run)")
+    print(f"{'method':<28}{'total ms':>10}{'us/text':>10}{'speedup':>10}")
+    for name, t in [
+        ('legacy apply (per-row)', legacy),
+        ('clean_texts (Series)', batch_series),
+        ('clean_texts (list)', batch_list),
+    ]:
+        print(f"{name:<28}{t * 1000:>10.2f}{t / n * 1e6:>10.2f}{legacy / t:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark feature backend: TF-IDF vs feature hashing (dengan/tanpa IDF)
+
+Untuk setiap backend diukur akurasi/F1 (train_svm_model pada split yang
+sama), waktu fit + transform, throughput transform, ukuran vectorizer
+ter-pickle, dan peak alokasi memory saat vectorize.
+
+Usage:
+    python benchmarks/bench_features.py
+    python benchmarks/bench_features.py --scale 20 --n-jobs 4 --backend linearsvc
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sklearn.metrics import accuracy_score, f1_score
+
+from src.modeling import (
+    prepare_data, hash_texts, vectorize_text,
+    train_svm_model, vectorizer_size
+)
+import config
+
+
+CASES = [
+    ('tfidf', 'tfidf', None),
+    ('hashing', 'hashing', False),
+    ('hashing + idf', 'hashing', True),
+]
+
+
+def transform_throughput(vectorizer, texts, n_jobs):
+    """Throughput transform (teks/detik) pada vectorizer yang sudah di-fit"""
+    start = time.perf_counter()
+    if hasattr(vectorizer, 'named_steps'):
+        vectorizer.named_steps['idf'].transform(
+            hash_texts(vectorizer.named_steps['hashing'], texts, n_jobs)
+        )
+    elif hasattr(vectorizer, 'vocabulary_'):
+        vectorizer.transform(texts)
+    else:
+        hash_texts(vectorizer, texts, n_jobs)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def run_case(feature_backend, use_idf, splits, backend, scale, n_jobs):
+    X_train, X_test, y_train, y_test = splits
+
+    # Vectorize dengan konfigurasi backend yang diuji
+    original_idf = config.HASHING_USE_IDF
+    config.HASHING_USE_IDF = bool(use_idf)
+    try:
+        tracemalloc.start()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            vectorizer, X_train_vec, X_test_vec = vectorize_text(X_train, X_test, feature_backend)
+        fit_time = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        config.HASHING_USE_IDF = original_idf
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = train_svm_model(X_train_vec, y_train, backend)
+    y_pred = model.predict(X_test_vec)
+
+    texts = list(X_train) * scale
+    return {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred, average='weighted'),
+        'fit_ms': fit_time * 1000,
+        'transform_per_sec': transform_throughput(vectorizer, texts, n_jobs),
+        'vectorizer_kb': vectorizer_size(vectorizer) / 1024,
+        'peak_mb': peak / (1024 * 1024),
+        'n_features': X_train_vec.shape[1]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark feature backend')
+    parser.add_argument('--backend', type=str, default=config.TRAIN_BACKEND,
+                        choices=['svc', 'linearsvc', 'sgd'], help='Training backend')
+    parser.add_argument('--scale', type=int, default=10,
+                        help='Pengali data train untuk mengukur throughput transform')
+    parser.add_argument('--n-jobs', type=int, default=config.FEATURE_N_JOBS,
+                        help='Worker untuk hashing paralel')
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        splits = prepare_data(config.PROCESSED_DATA)
+
+    print(f"Training backend: {args.backend}, hashing features: {config.HASHING_N_FEATURES}, "
+          f"throughput on {len(splits[0]) * args.scale} texts (n_jobs={args.n_jobs})")
+    print(f"{'features':<16}{'accuracy':>10}{'f1':>8}{'fit ms':>9}{'texts/s':>11}"
+          f"{'pickle KB':>11}{'peak MB':>9}{'n_features':>12}")
+    for name, feature_backend, use_idf in CASES:
+        r = run_case(feature_backend, use_idf, splits, args.backend, args.scale, args.n_jobs)
+        print(
+            f"{name:<16}{r['accuracy']:>10.4f}{r['f1']:>8.4f}{r['fit_ms']:>9.1f}"
+            f"{r['transform_per_sec']:>11.0f}{r['vectorizer_kb']:>11.1f}{r['peak_mb']:>9.1f}"
+            f"{r['n_features']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
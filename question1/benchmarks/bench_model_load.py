@@ -0,0 +1,104 @@
+"""
+Benchmark load model: joblib (3 pickle) vs model bundle (memory-mapped)
+
+Usage:
+    python benchmarks/bench_model_load.py
+    python benchmarks/bench_model_load.py --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from src.bundle import load_bundle
+from src.registry import artifact_paths
+import config
+
+PATHS = artifact_paths()
+
+
+def load_joblib():
+    return (
+        joblib.load(PATHS['vectorizer']),
+        joblib.load(PATHS['model']),
+        joblib.load(PATHS['label_encoder'])
+    )
+
+
+def load_bundle_verified():
+    return load_bundle(PATHS['bundle'], verify=True)
+
+
+def load_bundle_unverified():
+    return load_bundle(PATHS['bundle'], verify=False)
+
+
+def measure(loader, repeat):
+    """Waktu load terbaik/median dan alokasi heap Python per load"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loader()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    artifacts = loader()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return artifacts, min(times), float(np.median(times)), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark load model')
+    parser.add_argument('--repeat', type=int, default=20, help='Jumlah pengulangan')
+    args = parser.parse_args()
+
+    if not os.path.exists(PATHS['bundle']):
+        print("Model bundle belum ada, jalankan: python main.py --mode train")
+        sys.exit(1)
+
+    size_joblib = sum(
+        os.path.getsize(p)
+        for p in (PATHS['model'], PATHS['vectorizer'], PATHS['label_encoder'])
+    )
+    size_bundle = os.path.getsize(PATHS['bundle'])
+
+    rows = []
+    for name, loader, size in [
+        ('joblib (3 pickle)', load_joblib, size_joblib),
+        ('bundle (checksum)', load_bundle_verified, size_bundle),
+        ('bundle (no checksum)', load_bundle_unverified, size_bundle),
+    ]:
+        artifacts, best, median, peak = measure(loader, args.repeat)
+        rows.append((name, artifacts, best, median, peak, size))
+
+    # Prediksi kedua format harus sama
+    texts = pd.read_csv(config.PROCESSED_DATA)['question'].tolist()
+    expected = None
+    for name, (vectorizer, model, _), *_ in rows:
+        predictions = model.predict(vectorizer.transform(texts))
+        if expected is None:
+            expected = predictions
+        assert (predictions == expected).all(), name
+
+    baseline = rows[0][2]
+    print(f"Repeat: {args.repeat}, predictions identical on {len(texts)} texts")
+    print(f"{'format':<24}{'best ms':>10}{'median ms':>11}{'heap KB':>10}{'file KB':>10}{'speedup':>10}")
+    for name, _, best, median, peak, size in rows:
+        print(
+            f"{name:<24}{best * 1000:>10.2f}{median * 1000:>11.2f}"
+            f"{peak / 1024:>10.1f}{size / 1024:>10.1f}{baseline / best:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
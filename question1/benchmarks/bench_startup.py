@@ -0,0 +1,110 @@
+"""
+Benchmark waktu startup CLI untuk setiap mode
+
+Mode ringan (predict, batch, evaluate, serve) dijalankan end-to-end;
+untuk serve diukur sampai server siap menerima request. Mode berat
+(preprocess, train) hanya diukur waktu import module yang dipakai mode tsb.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --output results/startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+MAIN = str(BASE_DIR / 'main.py')
+
+
+def import_only(statement):
+    """Command untuk mengukur waktu import saja"""
+    return [sys.executable, '-c', f"import sys; sys.path.append({str(BASE_DIR)!r}); {statement}"]
+
+
+def time_command(command):
+    """Waktu eksekusi satu command (detik)"""
+    start = time.perf_counter()
+    subprocess.run(command, cwd=BASE_DIR, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def time_serve_ready(port):
+    """Waktu sampai serve mode mencetak 'Serving on' (detik)"""
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-u', MAIN, '--mode', 'serve', '--port', str(port)],
+        cwd=BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        for line in process.stdout:
+            if line.startswith('Serving on'):
+                return time.perf_counter() - start
+        raise RuntimeError("Serve mode berhenti sebelum siap")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark startup CLI')
+    parser.add_argument('--runs', type=int, default=5, help='Jumlah run per mode')
+    parser.add_argument('--port', type=int, default=8791, help='Port untuk serve mode')
+    parser.add_argument('--output', type=str, help='Simpan hasil ke file JSON')
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        f.write("internet mati\nharga paket 1D\nmau pasang baru\n")
+        batch_file = f.name
+
+    cases = {
+        'python (baseline)': lambda: time_command([sys.executable, '-c', 'pass']),
+        '--help': lambda: time_command([sys.executable, MAIN, '--help']),
+        'predict': lambda: time_command(
+            [sys.executable, MAIN, '--mode', 'predict', '--text', 'internet mati']),
+        'batch': lambda: time_command(
+            [sys.executable, MAIN, '--mode', 'batch', '--file', batch_file]),
+        'evaluate': lambda: time_command([sys.executable, MAIN, '--mode', 'evaluate']),
+        'serve (ready)': lambda: time_serve_ready(args.port),
+        'preprocess (import)': lambda: time_command(
+            import_only('from src.preprocessing import clean_data')),
+        'train (import)': lambda: time_command(
+            import_only('from src.modeling import train_pipeline')),
+    }
+
+    results = {}
+    try:
+        for name, run in cases.items():
+            times = [run() for _ in range(args.runs)]
+            results[name] = {
+                'median_ms': statistics.median(times) * 1000,
+                'min_ms': min(times) * 1000,
+                'max_ms': max(times) * 1000
+            }
+    finally:
+        os.remove(batch_file)
+        results_file = batch_file.replace('.txt', '_results.txt')
+        if os.path.exists(results_file):
+            os.remove(results_file)
+
+    print(f"Runs per mode: {args.runs}")
+    print(f"{'mode':<22}{'median ms':>11}{'min ms':>10}{'max ms':>10}")
+    for name, r in results.items():
+        print(f"{name:<22}{r['median_ms']:>11.1f}{r['min_ms']:>10.1f}{r['max_ms']:>10.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nHasil disimpan: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,17 +15,114 @@ PROCESSED_DATA = os.path.join(DATA_DIR, 'question_list_modeling.csv')
 SVM_MODEL_FILE = os.path.join(MODELS_DIR, 'svm_model.pkl')
 VECTORIZER_FILE = os.path.join(MODELS_DIR, 'tfidf_vectorizer.pkl')
 LABEL_ENCODER_FILE = os.path.join(MODELS_DIR, 'label_encoder.pkl')
+LINEAR_WEIGHTS_FILE = os.path.join(MODELS_DIR, 'linear_weights.npz')
+MODEL_BUNDLE_FILE = os.path.join(MODELS_DIR, 'classifier.bundle')
+MODEL_VERSION_FILE = os.path.join(MODELS_DIR, 'model_version.txt')
+PREDICTION_CACHE_FILE = os.path.join(MODELS_DIR, 'prediction_cache.pkl')
+STEM_CACHE_FILE = os.path.join(MODELS_DIR, 'stem_cache.pkl')
+STAGE_CACHE_DIR = os.path.join(MODELS_DIR, 'stages')
+
+# Model registry: setiap training menulis models/versions/<id>, pointer
+# CURRENT diganti atomic. Path *_FILE di atas jadi nama file di dalam versi
+# (dan fallback untuk model lama tanpa registry).
+MODEL_VERSIONS_DIR = os.path.join(MODELS_DIR, 'versions')
+MODEL_CURRENT_FILE = os.path.join(MODELS_DIR, 'CURRENT')
+MODEL_REGISTRY_KEEP = 5  # jumlah versi terbaru yang disimpan
+# Hot reload: MessageClassifier memantau CURRENT dan swap ke versi baru
+MODEL_AUTO_RELOAD = False
+MODEL_RELOAD_INTERVAL = 5.0  # detik
 
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
 TFIDF_MAX_FEATURES = 5000
 TFIDF_NGRAM_RANGE = (1, 2)
 
+# Feature backend: 'tfidf' (TfidfVectorizer, vocabulary di-fit) atau
+# 'hashing' (HashingVectorizer, stateless, memory tetap, bisa paralel)
+FEATURE_BACKEND = 'tfidf'
+# Jumlah fitur hashing, juga untuk incremental update (--mode update):
+# HashingVectorizer + SGDClassifier.partial_fit
+HASHING_N_FEATURES = 2 ** 18
+# IDF reweighting setelah hashing (HashingVectorizer + TfidfTransformer)
+HASHING_USE_IDF = True
+# Worker dan ukuran chunk untuk hashing paralel
+FEATURE_N_JOBS = 1
+FEATURE_CHUNKSIZE = 10000
+
+# Training backend: 'svc' (SVC), 'linearsvc' (LinearSVC), 'sgd' (SGDClassifier)
+TRAIN_BACKEND = 'svc'
+# Ukur peak memory training dengan tracemalloc pada fit terpisah (tidak dihitung
+# di train time, training jadi ~2x lebih lama)
+TRAIN_MEASURE_MEMORY = False
+
 SVM_KERNEL = 'linear'
+SVM_C = 1.0
 SVM_CLASS_WEIGHT = 'balanced'
+# Probabilitas terkalibrasi (Platt scaling), menambah waktu training
+SVM_PROBABILITY = False
+SGD_ALPHA = 0.0001
+# Inferensi model linear dengan bobot NumPy (tanpa SVC.predict/libsvm)
+LINEAR_FAST_PATH = True
+# Format model untuk inferensi: 'bundle' (satu file memory-mapped, fallback
+# ke joblib jika bundle tidak ada) atau 'joblib'
+MODEL_FORMAT = 'bundle'
+BUNDLE_VERIFY_CHECKSUM = True
 
 CATEGORIES = ['Information', 'Problem', 'Request']
 
+# Hyperparameter search (--mode tune)
+TUNE_SEARCH = 'grid'  # 'grid' atau 'random'
+TUNE_N_ITER = 20  # jumlah kombinasi untuk random search
+TUNE_CV_FOLDS = 5
+TUNE_SCORING = 'f1_weighted'
+TUNE_N_JOBS = -1  # semua core
+TUNE_PARAM_GRID = {
+    'vectorizer__max_features': [1000, 3000, 5000, None],
+    'vectorizer__ngram_range': [(1, 1), (1, 2), (1, 3)],
+    'svm__kernel': ['linear', 'rbf'],
+    'svm__C': [0.1, 1.0, 10.0]
+}
+TUNE_RESULTS_FILE = os.path.join(RESULTS_DIR, 'tuning_results.csv')
+
+# Instrumentasi latency per tahap (histogram, GET /metrics di serve mode).
+# Bisa juga diaktifkan dengan flag --metrics
+METRICS_ENABLED = False
+METRICS_PREFIX = 'message_classifier'
+# Jumlah baris ringkasan cProfile untuk flag --profile
+PROFILE_TOP = 25
+
+# Benchmark suite (--mode bench)
+BENCH_SIZES = [10000]  # baris data sintetis (100k/1M lewat --sizes)
+BENCH_LATENCY_SAMPLES = 1000  # pesan untuk latency preprocess_text/predict
+BENCH_SVC_MAX_ROWS = 50000  # SVC (libsvm) dilewati di atas jumlah ini
+BENCH_OUTPUT_FILE = os.path.join(RESULTS_DIR, 'benchmark.json')
+
+# Batch prediction (--mode batch)
+BATCH_CHUNKSIZE = 1000
+BATCH_TEXT_COLUMN = 'question'
+
+# Classification server (--mode serve)
+SERVE_HOST = '127.0.0.1'
+SERVE_PORT = 8000
+SERVE_MAX_BATCH_SIZE = 64
+SERVE_MAX_WAIT_MS = 5
+SERVE_AUTO_RELOAD = True
+
+# Cache hasil prediksi (key: teks hasil preprocessing + fingerprint model)
+PREDICTION_CACHE_ENABLED = True
+PREDICTION_CACHE_SIZE = 10000
+PREDICTION_CACHE_TTL = 3600  # detik, None = tanpa TTL
+PREDICTION_CACHE_PERSIST = False
+
+# Cache tahap training (split, vectorizer, feature matrix .npz), key: content hash
+STAGE_CACHE_ENABLED = True
+STAGE_CACHE_MAX_ENTRIES = 4  # entry terbaru yang disimpan per tahap
+STAGE_CACHE_TUNE_BYTES = 512 * 1024 * 1024  # batas cache vectorizer tune mode
+
+# Cache stemming per token (LRU)
+STEM_CACHE_SIZE = 50000
+STEM_CACHE_PERSIST = True
+
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(MODELS_DIR, exist_ok=True)
\ No newline at end of file
@@ -5,18 +5,43 @@ Main script untuk Klasifikasi Pesan Customer
 Usage:
     # Data preprocessing
     python main.py --mode preprocess
+    python main.py --mode preprocess --workers 4
+    python main.py --mode preprocess --chunksize 10000
     
     # Model training
     python main.py --mode train
+    python main.py --mode train --backend linearsvc
+    python main.py --mode train --features hashing
+    python main.py --mode train --backend sgd --measure-memory
+    
+    # Hyperparameter search (stratified k-fold CV, semua core)
+    python main.py --mode tune
+    python main.py --mode tune --search random --n-iter 30 --folds 5
+    
+    # Incremental update dengan data berlabel baru (partial_fit)
+    python main.py --mode update --file new_labeled.csv
+    python main.py --mode update --file new_labeled.csv --bootstrap
     
     # Single prediction
     python main.py --mode predict --text "Contoh text"
     
     # Batch prediction
     python main.py --mode batch --file input.txt
+    python main.py --mode batch --file input.csv --text-column question --output-format jsonl --workers 4 --no-echo
     
     # Model evaluation
     python main.py --mode evaluate
+    
+    # Profiling: histogram latency per tahap dan/atau cProfile (semua mode)
+    python main.py --mode batch --file input.txt --no-echo --metrics
+    python main.py --mode predict --text "Contoh text" --profile
+    
+    # Benchmark suite (latency percentile + throughput per tahap, simpan JSON)
+    python main.py --mode bench
+    python main.py --mode bench --sizes 10000 100000 1000000 --compare results/benchmark_old.json
+    
+    # Classification server (model tetap warm, micro-batching)
+    python main.py --mode serve --port 8000
 """
 
 import argparse
@@ -26,43 +51,56 @@ from pathlib import Path
 # Add src to path
 sys.path.append(str(Path(__file__).parent))
 
-from src import (
-    clean_data,
-    train_pipeline,
-    MessageClassifier,
-    predict_category
-)
+# Module src di-import di dalam masing-masing mode agar startup tiap mode
+# hanya menanggung import yang dibutuhkan
 import config
 
 
-def run_preprocessing():
+def run_preprocessing(workers=1, chunksize=None):
     """Jalankan data preprocessing pipeline"""
     print("Data Preprocessing...")
     print("-"*40 + "\n")
     
     try:
-        clean_data(config.RAW_DATA, config.PROCESSED_DATA)
+        from src.preprocessing import clean_data
+        
+        clean_data(
+            config.RAW_DATA,
+            config.PROCESSED_DATA,
+            workers=workers,
+            chunksize=chunksize
+        )
         print("\nPreprocess completed")
     except Exception as e:
         print(f"\nError preprocessing: {e}")
         sys.exit(1)
 
 
-def run_training():
+def run_training(backend=None, feature_backend=None, measure_memory=False):
     """Jalankan model training pipeline"""
     print("Model Training...")
     print("-"*40 + "\n")
     
     try:
-        model, vectorizer, le, metrics = train_pipeline(config.PROCESSED_DATA)
+        from src.modeling import train_pipeline, format_train_memory, TRAIN_BACKENDS
+        
+        model, vectorizer, le, metrics = train_pipeline(
+            config.PROCESSED_DATA, backend, feature_backend,
+            measure_memory or None
+        )
         
         print("\n" + "-"*40)
         print("Hasil Train Model")
         print("-"*40)
-        print(f"Model: SVM (Support Vector Machine)")
-        print(f"Kernel: {config.SVM_KERNEL}")
+        print(f"Model: {TRAIN_BACKENDS[metrics['backend']]}")
+        if metrics['backend'] == 'svc':
+            print(f"Kernel: {config.SVM_KERNEL}")
+        print(f"Features: {metrics['feature_backend']}")
         print(f"Accuracy: {metrics['accuracy']:.4f}")
         print(f"F1 Score: {metrics['f1_score']:.4f}")
+        print(f"Train time: {metrics['train_time']:.3f}s")
+        print(f"Train peak memory: {format_train_memory(metrics)}")
+        print(f"Model version: {metrics['version']}")
         print("\nTraining completed")
         
     except Exception as e:
@@ -70,25 +108,92 @@ def run_training():
         sys.exit(1)
 
 
+def run_tuning(args):
+    """Jalankan hyperparameter search"""
+    print("Hyperparameter Search...")
+    print("-"*40 + "\n")
+    
+    try:
+        from src.tuning import tune_pipeline
+        
+        table, best_params, metrics = tune_pipeline(
+            config.PROCESSED_DATA,
+            search=args.search,
+            n_iter=args.n_iter,
+            folds=args.folds
+        )
+        
+        print("\n" + "-"*40)
+        print("Hasil Hyperparameter Search")
+        print("-"*40)
+        print("Best params:")
+        for name, value in best_params.items():
+            print(f"  {name}: {value}")
+        print(f"CV {config.TUNE_SCORING}: {metrics['cv_score']:.4f}")
+        print(f"Test Accuracy: {metrics['test_accuracy']:.4f}")
+        print(f"Test F1 Score: {metrics['test_f1_score']:.4f}")
+        print(f"Konfigurasi: {metrics['candidates']} ({metrics['search_time']:.1f}s)")
+        print("\nTuning completed")
+        
+    except Exception as e:
+        print(f"\nError during tuning: {e}")
+        sys.exit(1)
+
+
+def run_update(new_data_file, bootstrap=False):
+    """Jalankan incremental update model dengan data berlabel baru"""
+    print("Incremental Model Update...")
+    print("-"*40 + "\n")
+    
+    try:
+        from src.modeling import update_pipeline
+        
+        model, vectorizer, le, metrics = update_pipeline(new_data_file, bootstrap=bootstrap)
+        
+        print("\n" + "-"*40)
+        print("Hasil Update Model")
+        print("-"*40)
+        print(f"Model: SGDClassifier + HashingVectorizer ({config.HASHING_N_FEATURES} features)")
+        print(f"New rows: {metrics['rows']}")
+        if metrics['bootstrapped']:
+            print(f"Bootstrap dari data train: {config.PROCESSED_DATA}")
+        print("\nUpdate completed")
+        
+    except Exception as e:
+        print(f"\nError during update: {e}")
+        sys.exit(1)
+
+
 def run_prediction(text):
     """Jalankan single text prediction"""
     print("Predict text...")
     print("-"*40 + "\n")
     
     try:
+        from src.prediction import MessageClassifier
+        
         classifier = MessageClassifier()
-        prediction = classifier.predict(text)
+        
+        # Prediksi dan decision scores dari satu kali preprocess + vectorize
+        result = classifier.classify(text, with_proba=True)
         
         print(f"Input Text: {text}")
-        print(f"Predicted Category: {prediction}")
+        print(f"Predicted Category: {result['prediction']}")
         
-        # Dapatkan probability score
-        scores = classifier.predict_proba(text)
+        scores = result['scores']
         if scores:
             print("\nDecision Scores:")
             for category, score in scores.items():
                 print(f"  {category}: {score:.4f}")
         
+        probabilities = result['probabilities']
+        if probabilities:
+            print("\nProbabilities:")
+            for category, proba in probabilities.items():
+                print(f"  {category}: {proba:.4f}")
+        
+        classifier.save_cache()
+        
         print("\nPrediction completed!")
         
     except Exception as e:
@@ -96,38 +201,30 @@ def run_prediction(text):
         sys.exit(1)
 
 
-def run_batch_prediction(input_file):
-    """Jalankan batch prediction from file"""
+def run_batch_prediction(args):
+    """Jalankan streaming batch prediction from file"""
     print("Batch Prediction...")
     print("-"*40 + "\n")
     
     try:
-        # Read input file
-        with open(input_file, 'r', encoding='utf-8') as f:
-            texts = [line.strip() for line in f if line.strip()]
+        from src.batch import run_batch
         
-        print(f"Processing {len(texts)} messages...\n")
+        report = run_batch(
+            args.file,
+            output_file=args.output,
+            input_format=args.input_format,
+            output_format=args.output_format,
+            text_column=args.text_column,
+            chunksize=args.chunksize or config.BATCH_CHUNKSIZE,
+            workers=args.workers,
+            echo=args.echo
+        )
         
-        classifier = MessageClassifier()
-        
-        # Predict
-        results = []
-        for i, text in enumerate(texts, 1):
-            pred = classifier.predict(text)
-            results.append({
-                'no': i,
-                'text': text,
-                'prediction': pred
-            })
-            print(f"{i}. [{pred}] {text}")
-        
-        # Save results
-        output_file = input_file.replace('.txt', '_results.txt')
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for r in results:
-                f.write(f"{r['no']}. [{r['prediction']}] {r['text']}\n")
-        
-        print(f"\nHasil disimpan: {output_file}")
+        print(f"\nHasil disimpan: {report['output_file']}")
+        print(f"Processed {report['messages']} messages in {report['seconds']:.2f}s "
+              f"({report['messages_per_sec']:.1f} messages/sec)")
+        if report['cache']:
+            print(f"Prediction cache hit rate: {report['cache']['hit_rate']:.1%}")
         
     except Exception as e:
         print(f"\nError during batch prediction: {e}")
@@ -142,15 +239,21 @@ def run_evaluation():
     
     try:
         from src.modeling import prepare_data, evaluate_model
+        from src.stage_cache import StageCache
+        from src.registry import artifact_paths, current_version
         import joblib
         
-        # Load model
-        model = joblib.load(config.SVM_MODEL_FILE)
-        vectorizer = joblib.load(config.VECTORIZER_FILE)
+        # Load model (versi aktif di registry)
+        paths = artifact_paths()
+        model = joblib.load(paths['model'])
+        vectorizer = joblib.load(paths['vectorizer'])
+        print(f"Model version: {current_version()}")
         
-        # Prepare test data
-        _, X_test, _, y_test = prepare_data(config.PROCESSED_DATA)
-        X_test_tfidf = vectorizer.transform(X_test)
+        # Prepare test data (split dan hasil transform di-cache)
+        cache = StageCache()
+        split_key, (_, X_test, _, y_test) = cache.split(config.PROCESSED_DATA, prepare_data)
+        X_test_tfidf = cache.transformed(split_key, paths['vectorizer'], X_test, vectorizer)
+        print(f"Stage cache: {cache.summary()}")
         
         # Evaluate
         y_pred, metrics = evaluate_model(model, X_test_tfidf, y_test)
@@ -162,6 +265,54 @@ def run_evaluation():
         sys.exit(1)
 
 
+def run_bench(args):
+    """Jalankan benchmark suite"""
+    print("Benchmark Suite...")
+    print("-"*40)
+    
+    try:
+        from src.benchmark import run_benchmark, compare_reports
+        
+        report = run_benchmark(
+            sizes=args.sizes,
+            stages=args.stages,
+            backend=args.backend,
+            output_file=args.output
+        )
+        
+        if args.compare:
+            print(f"\nPerbandingan throughput dengan {args.compare}:")
+            print(f"{'dataset':<10}{'stage':<18}{'before/s':>12}{'after/s':>12}{'ratio':>8}")
+            for name, stage, before, after, ratio in compare_reports(report, args.compare):
+                print(f"{name:<10}{stage:<18}{before:>12.1f}{after:>12.1f}{ratio:>7.2f}x")
+        
+        print("\nBenchmark completed")
+        
+    except Exception as e:
+        print(f"\nError during benchmark: {e}")
+        sys.exit(1)
+
+
+def run_server(args):
+    """Jalankan classification server"""
+    print("Classification Server...")
+    print("-"*40 + "\n")
+    
+    try:
+        from src.server import serve
+        
+        serve(
+            host=args.host,
+            port=args.port,
+            socket_path=args.socket,
+            max_batch_size=args.batch_size,
+            max_wait_ms=args.max_wait_ms
+        )
+    except Exception as e:
+        print(f"\nError during serving: {e}")
+        sys.exit(1)
+
+
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(
@@ -170,10 +321,20 @@ def main():
         epilog="""
             Examples:
             python main.py --mode preprocess
+            python main.py --mode preprocess --workers 4
+            python main.py --mode preprocess --chunksize 10000
             python main.py --mode train
+            python main.py --mode train --backend sgd
+            python main.py --mode update --file new_labeled.csv
+            python main.py --mode tune --search random --n-iter 30
             python main.py --mode predict --text "Internet mati nih"
             python main.py --mode batch --file messages.txt
+            python main.py --mode batch --file messages.csv --output-format jsonl --no-echo
             python main.py --mode evaluate
+            python main.py --mode serve --port 8000
+            python main.py --mode bench --sizes 10000 --output results/bench.json
+            python main.py --mode serve --metrics
+            python main.py --mode train --profile
         """
     )
     
@@ -181,7 +342,7 @@ def main():
         '--mode',
         type=str,
         required=True,
-        choices=['preprocess', 'train', 'predict', 'batch', 'evaluate'],
+        choices=['preprocess', 'train', 'update', 'tune', 'predict', 'batch', 'evaluate', 'serve', 'bench'],
         help='Operation mode'
     )
     
@@ -194,17 +355,225 @@ def main():
     parser.add_argument(
         '--file',
         type=str,
-        help='Input file untuk batch prediction'
+        help='Input file untuk batch prediction atau data berlabel baru untuk update mode'
+    )
+    
+    parser.add_argument(
+        '--backend',
+        type=str,
+        choices=['svc', 'linearsvc', 'sgd'],
+        help='Training backend (default: config.TRAIN_BACKEND)'
+    )
+    
+    parser.add_argument(
+        '--features',
+        type=str,
+        choices=['tfidf', 'hashing'],
+        help='Feature backend (default: config.FEATURE_BACKEND)'
+    )
+    
+    parser.add_argument(
+        '--measure-memory',
+        action='store_true',
+        help='Train mode: ukur peak memory training dengan tracemalloc (fit terpisah, tidak masuk train time)'
+    )
+    
+    parser.add_argument(
+        '--bootstrap',
+        action='store_true',
+        help='Update mode: ganti model aktif yang tidak kompatibel dengan model incremental baru'
+    )
+    
+    parser.add_argument(
+        '--search',
+        type=str,
+        choices=['grid', 'random'],
+        help='Strategi search untuk tune mode (default: config.TUNE_SEARCH)'
+    )
+    
+    parser.add_argument(
+        '--n-iter',
+        type=int,
+        help='Jumlah kombinasi untuk random search (default: config.TUNE_N_ITER)'
+    )
+    
+    parser.add_argument(
+        '--folds',
+        type=int,
+        help='Jumlah fold stratified CV untuk tune mode (default: config.TUNE_CV_FOLDS)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Jumlah worker process (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        help='Jumlah baris per chunk (preprocess streaming / batch prediction)'
+    )
+    
+    parser.add_argument(
+        '--input-format',
+        type=str,
+        choices=['txt', 'csv', 'jsonl'],
+        help='Format input batch (default: dari ekstensi file)'
+    )
+    
+    parser.add_argument(
+        '--text-column',
+        type=str,
+        default=config.BATCH_TEXT_COLUMN,
+        help='Kolom/field teks untuk input csv/jsonl'
+    )
+    
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='File output batch (default: <input>_results.<format>) atau JSON bench mode (default: config.BENCH_OUTPUT_FILE)'
+    )
+    
+    parser.add_argument(
+        '--output-format',
+        type=str,
+        choices=['txt', 'csv', 'jsonl'],
+        help='Format output batch (default: sama dengan format input)'
+    )
+    
+    parser.add_argument(
+        '--echo',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Print setiap hasil batch ke console'
+    )
+    
+    parser.add_argument(
+        '--host',
+        type=str,
+        default=config.SERVE_HOST,
+        help='Host untuk serve mode'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=config.SERVE_PORT,
+        help='Port untuk serve mode'
+    )
+    
+    parser.add_argument(
+        '--socket',
+        type=str,
+        help='Path Unix socket untuk serve mode (menggantikan host/port)'
+    )
+    
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=config.SERVE_MAX_BATCH_SIZE,
+        help='Ukuran maksimal micro-batch untuk serve mode'
+    )
+    
+    parser.add_argument(
+        '--max-wait-ms',
+        type=float,
+        default=config.SERVE_MAX_WAIT_MS,
+        help='Waktu tunggu maksimal micro-batch (ms) untuk serve mode'
+    )
+    
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        help='Jumlah baris data sintetis untuk bench mode (default: config.BENCH_SIZES)'
+    )
+    
+    parser.add_argument(
+        '--stages',
+        type=str,
+        nargs='+',
+        choices=['preprocess_text', 'clean_data', 'vectorize_text', 'train_svm_model',
+                 'predict', 'batch_predict'],
+        help='Tahap yang diukur di bench mode (default: semua)'
+    )
+    
+    parser.add_argument(
+        '--compare',
+        type=str,
+        help='File JSON hasil bench sebelumnya untuk dibandingkan'
+    )
+    
+    parser.add_argument(
+        '--metrics',
+        action='store_true',
+        help='Aktifkan histogram latency per tahap (ringkasan dicetak di akhir, '
+             'GET /metrics di serve mode)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Jalankan mode dengan cProfile dan cetak ringkasan'
+    )
+    
+    parser.add_argument(
+        '--profile-output',
+        type=str,
+        help='Simpan hasil cProfile ke file (untuk pstats/snakeviz)'
     )
     
     args = parser.parse_args()
     
-    # Route ke masing-masing fungsi
+    if args.metrics:
+        from src.metrics import metrics
+        metrics.enable()
+    
+    try:
+        if args.profile or args.profile_output:
+            run_profiled(args)
+        else:
+            run_mode(args)
+    finally:
+        if args.metrics and args.mode != 'serve':
+            print("\nLatency per tahap:")
+            print(metrics.summary_table())
+
+
+def run_profiled(args):
+    """Jalankan mode di bawah cProfile lalu cetak ringkasan (cumulative time)"""
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run_mode, args)
+    finally:
+        if args.profile_output:
+            profiler.dump_stats(args.profile_output)
+            print(f"\nProfile disimpan: {args.profile_output}")
+        print(f"\ncProfile (top {config.PROFILE_TOP}, cumulative):")
+        pstats.Stats(profiler, stream=sys.stdout).sort_stats('cumulative').print_stats(config.PROFILE_TOP)
+
+
+def run_mode(args):
+    """Route ke masing-masing fungsi"""
     if args.mode == 'preprocess':
-        run_preprocessing()
+        run_preprocessing(args.workers, args.chunksize)
         
     elif args.mode == 'train':
-        run_training()
+        run_training(args.backend, args.features, args.measure_memory)
+        
+    elif args.mode == 'tune':
+        run_tuning(args)
+        
+    elif args.mode == 'update':
+        if not args.file:
+            print("Error: --file argument required for update mode")
+            sys.exit(1)
+        run_update(args.file, args.bootstrap)
         
     elif args.mode == 'predict':
         if not args.text:
@@ -216,10 +585,16 @@ def main():
         if not args.file:
             print("Error: --file argument required for batch mode")
             sys.exit(1)
-        run_batch_prediction(args.file)
+        run_batch_prediction(args)
         
     elif args.mode == 'evaluate':
         run_evaluation()
+        
+    elif args.mode == 'serve':
+        run_server(args)
+        
+    elif args.mode == 'bench':
+        run_bench(args)
 
 
 if __name__ == "__main__":
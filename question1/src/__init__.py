@@ -11,29 +11,70 @@ Author: Wahyu Adwitya
 Version: 1.0.0
 """
 
-from .preprocessing import (
-    preprocess_text,
-    clean_data,
-    remove_noise,
-    remove_punctuation,
-    remove_stopwords,
-    stem_text
-)
-
-from .modeling import (
-    prepare_data,
-    vectorize_text,
-    train_svm_model,
-    evaluate_model,
-    train_pipeline,
-    save_models
-)
-
-from .prediction import (
-    MessageClassifier,
-    predict_category,
-    predict_batch
-)
+import importlib
+
+# Export di-import secara lazy (saat pertama diakses), sehingga setiap mode
+# CLI hanya meng-import module yang dibutuhkan. Contoh: predict tidak perlu
+# sklearn.metrics/matplotlib dari modeling.
+_EXPORTS = {
+    # Preprocessing
+    'preprocess_text': 'preprocessing',
+    'preprocess_texts': 'preprocessing',
+    'clean_texts': 'preprocessing',
+    'clean_data': 'preprocessing',
+    'remove_noise': 'preprocessing',
+    'remove_punctuation': 'preprocessing',
+    'remove_stopwords': 'preprocessing',
+    'stem_text': 'preprocessing',
+    'StemCache': 'preprocessing',
+    'stem_cache': 'preprocessing',
+    
+    # Modeling
+    'prepare_data': 'modeling',
+    'vectorize_text': 'modeling',
+    'train_svm_model': 'modeling',
+    'evaluate_model': 'modeling',
+    'train_pipeline': 'modeling',
+    'update_pipeline': 'modeling',
+    'save_models': 'modeling',
+    'tune_pipeline': 'tuning',
+    'StageCache': 'stage_cache',
+    'run_benchmark': 'benchmark',
+    # Registry global: `from src.metrics import metrics` (nama sama dengan submodule)
+    'MetricsRegistry': 'metrics',
+    
+    # Prediction
+    'LinearScorer': 'linear',
+    'PredictionCache': 'cache',
+    'BundleVectorizer': 'bundle',
+    'save_bundle': 'bundle',
+    'load_bundle': 'bundle',
+    'MessageClassifier': 'prediction',
+    'ModelState': 'prediction',
+    'predict_category': 'prediction',
+    'predict_batch': 'prediction',
+    
+    # Server
+    'MicroBatcher': 'server',
+    'ClassificationServer': 'server',
+    'serve': 'server'
+}
+
+
+def __getattr__(name):
+    """Import module yang berisi export saat pertama diakses"""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 __version__ = "1.0.0"
 __author__ = "Your Name"
@@ -41,11 +82,15 @@ __author__ = "Your Name"
 __all__ = [
     # Preprocessing
     'preprocess_text',
+    'preprocess_texts',
+    'clean_texts',
     'clean_data',
     'remove_noise',
     'remove_punctuation',
     'remove_stopwords',
     'stem_text',
+    'StemCache',
+    'stem_cache',
     
     # Modeling
     'prepare_data',
@@ -53,10 +98,26 @@ __all__ = [
     'train_svm_model',
     'evaluate_model',
     'train_pipeline',
+    'update_pipeline',
     'save_models',
+    'tune_pipeline',
+    'StageCache',
+    'run_benchmark',
+    'MetricsRegistry',
     
     # Prediction
+    'LinearScorer',
+    'PredictionCache',
+    'BundleVectorizer',
+    'save_bundle',
+    'load_bundle',
     'MessageClassifier',
+    'ModelState',
     'predict_category',
-    'predict_batch'
+    'predict_batch',
+    
+    # Server
+    'MicroBatcher',
+    'ClassificationServer',
+    'serve'
 ]
\ No newline at end of file
@@ -0,0 +1,203 @@
+"""
+Modul untuk batch prediction secara streaming
+
+Input dibaca per chunk (TXT, CSV, atau JSONL), setiap chunk diklasifikasi
+sebagai satu batch (predict_many), dan hasil langsung ditulis ke file output
+(TXT, CSV, atau JSONL) sehingga memory tetap kecil untuk file besar.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .prediction import MessageClassifier
+import config
+
+FORMATS = ('txt', 'csv', 'jsonl')
+
+# Classifier per worker process (dibuat sekali di _init_worker)
+_worker_classifier = None
+
+
+def detect_format(path):
+    """Tebak format file dari ekstensi (default: txt)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return 'csv'
+    if ext in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    return 'txt'
+
+
+def default_output_file(input_file, output_format):
+    """Path output default: <input>_results.<format>"""
+    root, _ = os.path.splitext(input_file)
+    return f"{root}_results.{output_format}"
+
+
+def iter_text_chunks(input_file, input_format, text_column, chunksize):
+    """
+    Baca teks input per chunk
+
+    Args:
+        input_file (str): Path file input
+        input_format (str): 'txt', 'csv', atau 'jsonl'
+        text_column (str): Nama kolom/field teks (csv/jsonl)
+        chunksize (int): Jumlah teks per chunk
+
+    Yields:
+        list: Kumpulan teks dalam satu chunk
+    """
+    if input_format == 'csv':
+        import pandas as pd
+
+        for chunk in pd.read_csv(input_file, chunksize=chunksize, usecols=[text_column]):
+            yield chunk[text_column].fillna('').astype(str).tolist()
+        return
+
+    chunk = []
+    with open(input_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if input_format == 'jsonl':
+                chunk.append(str(json.loads(line)[text_column]))
+            else:
+                chunk.append(line)
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+class ResultWriter:
+    """Menulis hasil prediksi secara incremental ke TXT, CSV, atau JSONL"""
+
+    FIELDS = ['no', 'text', 'prediction']
+
+    def __init__(self, path, output_format):
+        self.output_format = output_format
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self._csv = None
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(self.file, fieldnames=self.FIELDS)
+            self._csv.writeheader()
+
+    def write(self, records):
+        """Tulis list of dict {'no', 'text', 'prediction'}"""
+        if self.output_format == 'csv':
+            self._csv.writerows(records)
+        elif self.output_format == 'jsonl':
+            self.file.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
+        else:
+            self.file.writelines(f"{r['no']}. [{r['prediction']}] {r['text']}\n" for r in records)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker():
+    """Initializer worker: load model sekali per process"""
+    global _worker_classifier
+    _worker_classifier = MessageClassifier()
+
+
+def _predict_chunk(texts):
+    """Klasifikasi satu chunk di worker process"""
+    return [str(pred) for pred in _worker_classifier.predict_many(texts)]
+
+
+def _iter_predictions(chunks, workers, classifier=None):
+    """
+    Prediksi setiap chunk, berurutan sesuai input
+
+    Dengan workers > 1, chunk dikirim ke process pool dengan jumlah chunk
+    in-flight dibatasi (2 x workers) agar memory tetap terbatas.
+
+    Yields:
+        tuple: (texts, predictions) per chunk
+    """
+    if workers <= 1:
+        for texts in chunks:
+            yield texts, [str(pred) for pred in classifier.predict_many(texts)]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = deque()
+        for texts in chunks:
+            pending.append((texts, executor.submit(_predict_chunk, texts)))
+            if len(pending) >= workers * 2:
+                texts, future = pending.popleft()
+                yield texts, future.result()
+        while pending:
+            texts, future = pending.popleft()
+            yield texts, future.result()
+
+
+def run_batch(input_file, output_file=None, input_format=None, output_format=None,
+              text_column=config.BATCH_TEXT_COLUMN, chunksize=config.BATCH_CHUNKSIZE,
+              workers=1, echo=True):
+    """
+    Streaming batch prediction dari file
+
+    Args:
+        input_file (str): Path file input
+        output_file (str): Path file output (default: <input>_results.<format>)
+        input_format (str): 'txt', 'csv', atau 'jsonl' (default: dari ekstensi)
+        output_format (str): 'txt', 'csv', atau 'jsonl' (default: txt untuk
+            input txt, selain itu sama dengan format input)
+        text_column (str): Nama kolom/field teks untuk input csv/jsonl
+        chunksize (int): Jumlah teks per chunk
+        workers (int): Jumlah worker process
+        echo (bool): Print setiap hasil ke console
+
+    Returns:
+        dict: Jumlah pesan, waktu proses, throughput, path output, dan
+            statistik cache prediksi (mode serial)
+    """
+    input_format = input_format or detect_format(input_file)
+    output_format = output_format or input_format
+    output_file = output_file or default_output_file(input_file, output_format)
+
+    start = time.perf_counter()
+    total = 0
+    chunks = iter_text_chunks(input_file, input_format, text_column, chunksize)
+    classifier = MessageClassifier() if workers <= 1 else None
+
+    with ResultWriter(output_file, output_format) as writer:
+        for texts, predictions in _iter_predictions(chunks, workers, classifier):
+            records = [
+                {'no': total + i, 'text': text, 'prediction': pred}
+                for i, (text, pred) in enumerate(zip(texts, predictions), 1)
+            ]
+            writer.write(records)
+            total += len(records)
+
+            if echo:
+                for r in records:
+                    print(f"{r['no']}. [{r['prediction']}] {r['text']}")
+
+    elapsed = time.perf_counter() - start
+    cache_stats = None
+    if classifier is not None:
+        cache_stats = classifier.cache_stats()
+        classifier.save_cache()
+
+    return {
+        'messages': total,
+        'seconds': elapsed,
+        'messages_per_sec': total / elapsed if elapsed > 0 else 0.0,
+        'output_file': output_file,
+        'cache': cache_stats
+    }
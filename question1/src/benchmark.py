@@ -0,0 +1,329 @@
+"""
+Modul untuk benchmark suite (--mode bench)
+
+Mengukur latency (percentile) dan throughput setiap tahap: preprocess_text,
+clean_data, vectorize_text, train_svm_model, single predict, dan batch
+prediction, pada data berlabel asli dan salinan sintetis yang diperbesar
+(default 10k baris, 100k/1M lewat --sizes). Hasil disimpan sebagai JSON
+beserta commit git dan versi library, sehingga bisa dibandingkan antar commit
+(--compare).
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from .modeling import vectorize_text, train_svm_model
+from .preprocessing import preprocess_text, clean_data, stem_cache
+import config
+
+STAGES = ('preprocess_text', 'clean_data', 'vectorize_text', 'train_svm_model',
+          'predict', 'batch_predict')
+
+
+def latency_summary(seconds):
+    """
+    Ringkasan latency dari daftar durasi (detik)
+
+    Returns:
+        dict: count, mean/p50/p90/p99/max dalam milidetik
+    """
+    ms = np.asarray(seconds, dtype=np.float64) * 1000
+    return {
+        'count': int(ms.size),
+        'mean_ms': float(ms.mean()),
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p90_ms': float(np.percentile(ms, 90)),
+        'p99_ms': float(np.percentile(ms, 99)),
+        'max_ms': float(ms.max())
+    }
+
+
+def synthetic_data(df, n_rows, seed=config.RANDOM_STATE):
+    """
+    Salinan sintetis data berlabel dengan n_rows baris
+
+    Setiap baris menggabungkan dua pesan acak dengan label yang sama, sehingga
+    vocabulary tetap realistis tetapi hampir semua baris unik (tidak hilang
+    oleh deduplikasi di clean_data maupun cache prediksi).
+
+    Args:
+        df (pd.DataFrame): Data berlabel (kolom question, label)
+        n_rows (int): Jumlah baris output
+
+    Returns:
+        pd.DataFrame: Data sintetis (kolom question, label)
+    """
+    if n_rows <= len(df):
+        return df.sample(n=n_rows, random_state=seed).reset_index(drop=True)
+
+    rng = np.random.default_rng(seed)
+    questions = df['question'].to_numpy(dtype=object)
+    labels = df['label'].to_numpy(dtype=object)
+
+    first = rng.integers(0, len(df), n_rows)
+    # Pasangan diambil dari baris dengan label yang sama
+    second = np.empty(n_rows, dtype=np.int64)
+    for label in np.unique(labels):
+        pool = np.flatnonzero(labels == label)
+        mask = labels[first] == label
+        second[mask] = pool[rng.integers(0, len(pool), int(mask.sum()))]
+
+    return pd.DataFrame({
+        'question': questions[first] + ' ' + questions[second],
+        'label': labels[first]
+    })
+
+
+def _quiet(func, *args, **kwargs):
+    """Jalankan fungsi tanpa output print"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def bench_preprocess_text(texts, samples):
+    """Latency per pesan preprocess_text (stem cache dikosongkan dulu)"""
+    stem_cache.clear()
+    sample = texts[:samples]
+    times = []
+    for text in sample:
+        start = time.perf_counter()
+        preprocess_text(text)
+        times.append(time.perf_counter() - start)
+    return {
+        **latency_summary(times),
+        'throughput_per_sec': len(sample) / sum(times)
+    }
+
+
+def bench_clean_data(df):
+    """clean_data end-to-end (baca CSV, dedupe, preprocess, tulis CSV), stem cache dingin"""
+    stem_cache.clear()
+    # Stem cache tersimpan tidak di-load maupun ditimpa selama benchmark
+    persist = config.STEM_CACHE_PERSIST
+    config.STEM_CACHE_PERSIST = False
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            input_file = os.path.join(tmp, 'input.csv')
+            output_file = os.path.join(tmp, 'output.csv')
+            df.to_csv(input_file, index=False)
+
+            start = time.perf_counter()
+            cleaned = _quiet(clean_data, input_file, output_file)
+            elapsed = time.perf_counter() - start
+    finally:
+        config.STEM_CACHE_PERSIST = persist
+
+    return {
+        'rows': len(df),
+        'rows_out': len(cleaned),
+        'seconds': elapsed,
+        'throughput_per_sec': len(df) / elapsed
+    }, cleaned
+
+
+def bench_vectorize(cleaned):
+    """Fit + transform vectorizer pada split 80/20 (acak) data hasil cleaning"""
+    cleaned = cleaned.sample(frac=1, random_state=config.RANDOM_STATE)
+    split = int(len(cleaned) * (1 - config.TEST_SIZE))
+    X_train = cleaned['question'].iloc[:split]
+    X_test = cleaned['question'].iloc[split:]
+
+    start = time.perf_counter()
+    vectorizer, X_train_vec, X_test_vec = _quiet(vectorize_text, X_train, X_test)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'rows': len(cleaned),
+        'n_features': int(X_train_vec.shape[1]),
+        'seconds': elapsed,
+        'throughput_per_sec': len(cleaned) / elapsed
+    }, X_train_vec, cleaned['label'].iloc[:split]
+
+
+def bench_train(X_train, y_train, backend):
+    """train_svm_model pada feature matrix train"""
+    backend = backend or config.TRAIN_BACKEND
+    if backend == 'svc' and X_train.shape[0] > config.BENCH_SVC_MAX_ROWS:
+        return {
+            'backend': backend,
+            'rows': int(X_train.shape[0]),
+            'skipped': f"SVC di atas {config.BENCH_SVC_MAX_ROWS} baris, pakai --backend linearsvc/sgd"
+        }
+
+    start = time.perf_counter()
+    _quiet(train_svm_model, X_train, y_train, backend)
+    elapsed = time.perf_counter() - start
+    return {
+        'backend': backend,
+        'rows': int(X_train.shape[0]),
+        'seconds': elapsed,
+        'throughput_per_sec': X_train.shape[0] / elapsed
+    }
+
+
+def bench_predict(classifier, texts, samples):
+    """Latency single predict (tanpa cache prediksi)"""
+    sample = texts[:samples]
+    times = []
+    for text in sample:
+        start = time.perf_counter()
+        classifier.predict(text)
+        times.append(time.perf_counter() - start)
+    return {
+        **latency_summary(times),
+        'throughput_per_sec': len(sample) / sum(times)
+    }
+
+
+def bench_batch_predict(classifier, texts, chunksize=config.BATCH_CHUNKSIZE):
+    """Batch prediction per chunk (predict_many), latency per chunk"""
+    times = []
+    for i in range(0, len(texts), chunksize):
+        start = time.perf_counter()
+        classifier.predict_many(texts[i:i + chunksize])
+        times.append(time.perf_counter() - start)
+    return {
+        **latency_summary(times),
+        'chunksize': chunksize,
+        'rows': len(texts),
+        'throughput_per_sec': len(texts) / sum(times)
+    }
+
+
+def environment_info():
+    """Commit git, versi Python/library, dan jumlah CPU untuk konteks hasil"""
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=config.BASE_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'sklearn': sklearn.__version__,
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'cpu_count': os.cpu_count(),
+        'feature_backend': config.FEATURE_BACKEND
+    }
+
+
+def run_benchmark(sizes=None, stages=None, backend=None, output_file=None):
+    """
+    Jalankan benchmark suite
+
+    Args:
+        sizes (list): Jumlah baris sintetis (default: config.BENCH_SIZES);
+            data asli selalu diukur sebagai 'original'
+        stages (list): Tahap yang diukur (default: semua STAGES)
+        backend (str): Training backend untuk train_svm_model
+        output_file (str): Path JSON hasil (default: config.BENCH_OUTPUT_FILE)
+
+    Returns:
+        dict: Hasil per dataset per tahap, beserta info environment
+    """
+    from .prediction import MessageClassifier
+
+    sizes = sizes or config.BENCH_SIZES
+    stages = stages or STAGES
+    output_file = output_file or config.BENCH_OUTPUT_FILE
+
+    source = pd.read_csv(config.RAW_DATA)
+    if 'Unnamed: 0' in source.columns:
+        source = source.drop(columns='Unnamed: 0')
+
+    classifier = None
+    if 'predict' in stages or 'batch_predict' in stages:
+        classifier = _quiet(MessageClassifier)
+        classifier.cache = None  # ukur model, bukan cache prediksi
+
+    datasets = [('original', source)] + [
+        (str(n), synthetic_data(source, n)) for n in sizes
+    ]
+
+    report = {'environment': environment_info(), 'results': {}}
+    for name, df in datasets:
+        print(f"\nDataset {name} ({len(df)} rows)")
+        texts = df['question'].astype(str).tolist()
+        results = {}
+
+        if 'preprocess_text' in stages:
+            results['preprocess_text'] = bench_preprocess_text(texts, config.BENCH_LATENCY_SAMPLES)
+
+        cleaned = None
+        if {'clean_data', 'vectorize_text', 'train_svm_model'} & set(stages):
+            results['clean_data'], cleaned = bench_clean_data(df)
+            if 'clean_data' not in stages:
+                del results['clean_data']
+
+        if cleaned is not None and {'vectorize_text', 'train_svm_model'} & set(stages):
+            results['vectorize_text'], X_train, y_train = bench_vectorize(cleaned)
+            if 'train_svm_model' in stages:
+                results['train_svm_model'] = bench_train(X_train, y_train, backend)
+            if 'vectorize_text' not in stages:
+                del results['vectorize_text']
+
+        if 'predict' in stages:
+            results['predict'] = bench_predict(classifier, texts, config.BENCH_LATENCY_SAMPLES)
+
+        if 'batch_predict' in stages:
+            results['batch_predict'] = bench_batch_predict(classifier, texts)
+
+        for stage, r in results.items():
+            print(f"  {format_result(stage, r)}")
+        report['results'][name] = results
+
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nHasil disimpan: {output_file}")
+
+    return report
+
+
+def format_result(stage, r):
+    """Satu baris ringkasan hasil tahap"""
+    if 'skipped' in r:
+        return f"{stage:<17} skipped: {r['skipped']}"
+    line = f"{stage:<17}{r['throughput_per_sec']:>12.1f}/s"
+    if 'p50_ms' in r:
+        line += f"  p50 {r['p50_ms']:.3f} ms  p90 {r['p90_ms']:.3f} ms  p99 {r['p99_ms']:.3f} ms"
+    else:
+        line += f"  {r['seconds']:.3f}s"
+    return line
+
+
+def compare_reports(current, baseline_file):
+    """
+    Bandingkan throughput dengan hasil benchmark sebelumnya
+
+    Returns:
+        list: (dataset, stage, throughput lama, throughput baru, rasio)
+    """
+    with open(baseline_file) as f:
+        baseline = json.load(f)
+
+    rows = []
+    for name, results in current['results'].items():
+        for stage, r in results.items():
+            old = baseline['results'].get(name, {}).get(stage)
+            if not old or 'throughput_per_sec' not in old or 'throughput_per_sec' not in r:
+                continue
+            rows.append((name, stage, old['throughput_per_sec'], r['throughput_per_sec'],
+                         r['throughput_per_sec'] / old['throughput_per_sec']))
+    return rows
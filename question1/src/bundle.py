@@ -0,0 +1,276 @@
+"""
+Modul untuk format model bundle (satu file, memory-mappable)
+
+Isi bundle: vocabulary TF-IDF, vektor IDF, bobot linear, intercept, dan
+classes sebagai flat array. File di-memory-map saat load, sehingga beberapa
+worker process berbagi satu salinan fisik di page cache dan load tidak
+perlu unpickle dict vocabulary maupun support vectors SVC.
+
+Layout file:
+    MAGIC (8 byte) | panjang header (uint64 LE) | header JSON | payload
+
+Header berisi versi format, checksum SHA-256 payload, parameter vectorizer,
+dan offset/dtype/shape setiap array. Setiap array di-align 64 byte.
+"""
+
+import hashlib
+import json
+import re
+
+import numpy as np
+import scipy.sparse as sp
+
+from .linear import LinearScorer
+
+MAGIC = b'MCBUNDLE'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+class BundleVectorizer:
+    """
+    TF-IDF transform dari array vocabulary yang di-memory-map
+
+    Hasil transform sama dengan TfidfVectorizer.transform (analyzer 'word'),
+    selisih hanya pada pembulatan floating point.
+    Lookup term memakai binary search pada array term yang sudah diurutkan,
+    sehingga tidak ada dict vocabulary di memory process.
+    """
+
+    def __init__(self, terms, term_index, idf, params):
+        self.terms = terms
+        self.term_index = term_index
+        self.idf_ = idf
+        self.params = params
+        self.max_term_bytes = terms.dtype.itemsize
+        self._token_pattern = re.compile(params['token_pattern'])
+        self._min_n, self._max_n = params['ngram_range']
+
+
+    def build_analyzer(self):
+        """Analyzer yang sama dengan TfidfVectorizer (lowercase, token pattern, n-gram)"""
+        def analyze(doc):
+            if self.params['lowercase']:
+                doc = doc.lower()
+            tokens = self._token_pattern.findall(doc)
+            return self._word_ngrams(tokens)
+        return analyze
+
+
+    def _word_ngrams(self, tokens):
+        """Bentuk n-gram kata (port dari sklearn _VectorizerMixin._word_ngrams)"""
+        min_n, max_n = self._min_n, self._max_n
+        if max_n == 1:
+            return tokens
+
+        original_tokens = tokens
+        if min_n == 1:
+            tokens = list(original_tokens)
+            min_n += 1
+        else:
+            tokens = []
+
+        n_original_tokens = len(original_tokens)
+        for n in range(min_n, min(max_n + 1, n_original_tokens + 1)):
+            for i in range(n_original_tokens - n + 1):
+                tokens.append(" ".join(original_tokens[i:i + n]))
+
+        return tokens
+
+
+    def transform(self, raw_documents):
+        """
+        Transform teks ke matrix TF-IDF
+
+        Args:
+            raw_documents (list): Kumpulan teks yang sudah di-preprocess
+
+        Returns:
+            scipy.sparse.csr_matrix: Matrix TF-IDF (n_docs, n_features)
+        """
+        analyze = self.build_analyzer()
+        rows, keys = [], []
+        n_docs = 0
+        for doc in raw_documents:
+            for term in analyze(doc):
+                encoded = term.encode('utf-8')
+                # Term lebih panjang dari term terpanjang pasti tidak ada di vocabulary
+                if len(encoded) <= self.max_term_bytes:
+                    rows.append(n_docs)
+                    keys.append(encoded)
+            n_docs += 1
+
+        n_features = len(self.idf_)
+        keys = np.array(keys, dtype=self.terms.dtype)
+        positions = np.searchsorted(self.terms, keys)
+        positions[positions == len(self.terms)] = 0
+        found = self.terms[positions] == keys
+
+        X = sp.csr_matrix(
+            (
+                np.ones(int(found.sum()), dtype=np.float64),
+                (np.asarray(rows, dtype=np.int64)[found], self.term_index[positions[found]])
+            ),
+            shape=(n_docs, n_features)
+        )
+        X.sum_duplicates()
+
+        if self.params['sublinear_tf']:
+            np.log(X.data, X.data)
+            X.data += 1
+
+        if self.params['use_idf']:
+            X.data *= self.idf_[X.indices]
+
+        norm = self.params['norm']
+        if norm:
+            if norm == 'l2':
+                norms = np.sqrt(np.asarray(X.multiply(X).sum(axis=1)).ravel())
+            else:
+                norms = np.asarray(abs(X).sum(axis=1)).ravel()
+            norms[norms == 0] = 1
+            X.data /= np.repeat(norms, np.diff(X.indptr))
+
+        return X
+
+
+class BundleLabelEncoder:
+    """Pengganti LabelEncoder untuk bundle (classes_, transform, inverse_transform)"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+
+    def transform(self, y):
+        return np.searchsorted(self.classes_, np.asarray(y))
+
+
+    def inverse_transform(self, y):
+        return self.classes_[np.asarray(y)]
+
+
+def _vectorizer_params(vectorizer):
+    """
+    Ambil parameter TfidfVectorizer yang didukung bundle
+
+    Raises:
+        ValueError: Jika konfigurasi vectorizer tidak didukung
+    """
+    if not hasattr(vectorizer, 'vocabulary_') or (vectorizer.use_idf and not hasattr(vectorizer, 'idf_')):
+        raise ValueError("Bundle hanya mendukung TfidfVectorizer yang sudah di-fit")
+    if (vectorizer.analyzer != 'word' or vectorizer.tokenizer is not None
+            or vectorizer.preprocessor is not None or vectorizer.strip_accents is not None
+            or vectorizer.stop_words is not None or vectorizer.binary
+            or vectorizer.norm not in ('l1', 'l2', None)):
+        raise ValueError("Konfigurasi TfidfVectorizer tidak didukung oleh bundle")
+
+    return {
+        'ngram_range': list(vectorizer.ngram_range),
+        'lowercase': bool(vectorizer.lowercase),
+        'token_pattern': vectorizer.token_pattern,
+        'norm': vectorizer.norm,
+        'use_idf': bool(vectorizer.use_idf),
+        'sublinear_tf': bool(vectorizer.sublinear_tf)
+    }
+
+
+def save_bundle(path, vectorizer, scorer):
+    """
+    Simpan vectorizer dan bobot linear ke satu file bundle
+
+    Args:
+        path (str): Path output bundle
+        vectorizer: Fitted TfidfVectorizer
+        scorer (LinearScorer): Bobot model linear
+
+    Raises:
+        ValueError: Jika vectorizer tidak didukung
+    """
+    params = _vectorizer_params(vectorizer)
+    params['scheme'] = scorer.scheme
+
+    # Vocabulary diurutkan berdasarkan bytes UTF-8 agar bisa binary search
+    vocabulary = sorted(
+        (term.encode('utf-8'), index) for term, index in vectorizer.vocabulary_.items()
+    )
+    n_features = len(vectorizer.vocabulary_)
+    idf = vectorizer.idf_ if params['use_idf'] else np.ones(n_features)
+
+    arrays = {
+        'terms': np.array([term for term, _ in vocabulary]),
+        'term_index': np.array([index for _, index in vocabulary], dtype=np.int32),
+        'idf': np.ascontiguousarray(idf, dtype=np.float64),
+        'coef': np.ascontiguousarray(scorer.coef_, dtype=np.float64),
+        'intercept': np.ascontiguousarray(scorer.intercept_, dtype=np.float64),
+        'classes': np.array([str(c).encode('utf-8') for c in scorer.classes_])
+    }
+
+    # Susun payload dengan alignment
+    payload = bytearray()
+    meta = {}
+    for name, array in arrays.items():
+        payload.extend(b'\0' * (-len(payload) % ALIGNMENT))
+        meta[name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': len(payload)
+        }
+        payload.extend(array.tobytes())
+
+    header = {
+        'version': FORMAT_VERSION,
+        'checksum': hashlib.sha256(payload).hexdigest(),
+        'params': params,
+        'arrays': meta
+    }
+    header_bytes = json.dumps(header).encode('utf-8')
+    header_bytes += b' ' * (-(len(MAGIC) + 8 + len(header_bytes)) % ALIGNMENT)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(8, 'little'))
+        f.write(header_bytes)
+        f.write(payload)
+
+
+def load_bundle(path, verify=True):
+    """
+    Load bundle dengan memory-map
+
+    Args:
+        path (str): Path file bundle
+        verify (bool): Cek checksum payload
+
+    Returns:
+        tuple: BundleVectorizer, LinearScorer, BundleLabelEncoder
+
+    Raises:
+        ValueError: Jika file bukan bundle, versi tidak didukung, atau checksum salah
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    if bytes(data[:len(MAGIC)]) != MAGIC:
+        raise ValueError(f"Bukan file model bundle: {path}")
+
+    header_len = int.from_bytes(bytes(data[len(MAGIC):len(MAGIC) + 8]), 'little')
+    payload_start = len(MAGIC) + 8 + header_len
+    header = json.loads(bytes(data[len(MAGIC) + 8:payload_start]))
+
+    if header['version'] != FORMAT_VERSION:
+        raise ValueError(f"Versi bundle tidak didukung: {header['version']}")
+    if verify and hashlib.sha256(data[payload_start:]).hexdigest() != header['checksum']:
+        raise ValueError(f"Checksum bundle tidak cocok: {path}")
+
+    arrays = {}
+    for name, meta in header['arrays'].items():
+        dtype = np.dtype(meta['dtype'])
+        count = int(np.prod(meta['shape']))
+        arrays[name] = np.frombuffer(
+            data, dtype=dtype, count=count, offset=payload_start + meta['offset']
+        ).reshape(meta['shape'])
+
+    params = header['params']
+    classes = np.array([c.decode('utf-8') for c in arrays['classes']])
+    vectorizer = BundleVectorizer(arrays['terms'], arrays['term_index'], arrays['idf'], params)
+    scorer = LinearScorer(arrays['coef'], arrays['intercept'], classes, params['scheme'])
+
+    return vectorizer, scorer, BundleLabelEncoder(classes)
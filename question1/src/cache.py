@@ -0,0 +1,198 @@
+"""
+Modul untuk cache hasil prediksi
+
+Cache di-key dengan teks hasil preprocessing dan terikat ke fingerprint
+model, sehingga pesan yang berulang tidak perlu di-vectorize dan di-score
+ulang, dan cache otomatis tidak berlaku lagi saat model baru disimpan.
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import config
+
+
+def compute_model_fingerprint(paths):
+    """
+    Fingerprint model dari isi file artifact
+
+    Args:
+        paths (list): Path file artifact model
+
+    Returns:
+        str: Hex digest (16 karakter)
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def write_model_fingerprint(paths, version_file=config.MODEL_VERSION_FILE):
+    """Hitung dan simpan fingerprint model (dipanggil oleh save_models)"""
+    fingerprint = compute_model_fingerprint(paths)
+    with open(version_file, 'w') as f:
+        f.write(fingerprint)
+    return fingerprint
+
+
+def read_model_fingerprint(version_file=config.MODEL_VERSION_FILE):
+    """
+    Baca fingerprint model yang sedang tersimpan
+
+    Jika file versi belum ada (model lama), fingerprint dihitung dari
+    ukuran dan waktu modifikasi file artifact.
+    """
+    if os.path.exists(version_file):
+        with open(version_file) as f:
+            return f.read().strip()
+
+    digest = hashlib.sha256()
+    for path in (config.SVM_MODEL_FILE, config.VECTORIZER_FILE,
+                 config.LABEL_ENCODER_FILE, config.MODEL_BUNDLE_FILE):
+        if os.path.exists(path):
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+class PredictionCache:
+    """
+    Cache hasil prediksi dengan LRU + TTL eviction
+
+    Setiap entry adalah dict {'prediction', 'scores', ...} untuk satu teks
+    hasil preprocessing. Semua entry terikat ke fingerprint model; jika
+    fingerprint berubah, cache dikosongkan.
+    """
+
+    def __init__(self, maxsize=config.PREDICTION_CACHE_SIZE,
+                 ttl=config.PREDICTION_CACHE_TTL, fingerprint=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def set_fingerprint(self, fingerprint):
+        """Set fingerprint model, kosongkan cache jika berbeda"""
+        with self._lock:
+            if fingerprint != self.fingerprint:
+                self._data.clear()
+                self.fingerprint = fingerprint
+
+    def get(self, key):
+        """
+        Ambil entry dari cache
+
+        Returns:
+            dict: Entry, atau None jika tidak ada / sudah expired
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, entry = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry, fingerprint=None):
+        """
+        Simpan entry ke cache
+
+        Args:
+            fingerprint (str): Fingerprint model yang menghasilkan entry; jika
+                berbeda dengan fingerprint cache (model sudah di-reload), entry
+                tidak disimpan
+        """
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if fingerprint is not None and fingerprint != self.fingerprint:
+                return
+            self._data[key] = (expires_at, entry)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def record_hits(self, count):
+        """Catat hit yang dilayani tanpa get (mis. teks duplikat dalam satu batch)"""
+        with self._lock:
+            self.hits += count
+
+    def clear(self):
+        """Kosongkan cache dan reset counter"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.expired = self.evictions = 0
+
+    def stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: size, maxsize, hits, misses, expired, evictions, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def save(self, path):
+        """Simpan cache (beserta fingerprint model) ke disk"""
+        with self._lock:
+            state = {'fingerprint': self.fingerprint, 'entries': list(self._data.items())}
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, path):
+        """
+        Load cache dari disk jika file ada dan fingerprint model sama
+
+        Returns:
+            int: Jumlah entry yang di-load
+        """
+        if not os.path.exists(path):
+            return 0
+
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state['fingerprint'] != self.fingerprint:
+            return 0
+
+        now = time.time()
+        with self._lock:
+            for key, (expires_at, entry) in state['entries']:
+                if expires_at is None or expires_at >= now:
+                    self._data[key] = (expires_at, entry)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return len(self._data)
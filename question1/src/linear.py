@@ -0,0 +1,137 @@
+"""
+Modul untuk scoring model linear tanpa melalui sklearn/libsvm
+
+Bobot model linear (coef_ dan intercept_) di-export ke array NumPy, sehingga
+inferensi cukup satu perkalian sparse matrix x dense matrix.
+"""
+
+import numpy as np
+
+
+class LinearScorer:
+    """
+    Scorer untuk model linear (SVC kernel linear, LinearSVC, SGDClassifier)
+
+    Interface predict/decision_function sama dengan model sklearn, sehingga
+    bisa langsung dipakai oleh MessageClassifier.
+
+    Scheme:
+        - 'ovo': SVC multiclass (one-vs-one, voting seperti libsvm)
+        - 'ovr': LinearSVC/SGDClassifier multiclass (argmax)
+        - 'binary': satu hyperplane, positif berarti classes_[1]
+    """
+
+    def __init__(self, coef, intercept, classes, scheme):
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept_ = np.asarray(intercept, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.scheme = scheme
+        # Pasangan kelas (i, j) untuk setiap hyperplane ovo, urutan sama dengan libsvm
+        n_classes = len(self.classes_)
+        self._pairs = [(i, j) for i in range(n_classes) for j in range(i + 1, n_classes)]
+
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Export bobot dari model sklearn linear
+
+        Args:
+            model: Trained model dengan atribut coef_ dan intercept_
+
+        Returns:
+            LinearScorer
+
+        Raises:
+            AttributeError: Jika model bukan model linear (misal SVC kernel rbf)
+        """
+        coef = model.coef_
+        if hasattr(coef, 'toarray'):
+            coef = coef.toarray()
+
+        if coef.shape[0] == 1:
+            scheme = 'binary'
+        elif hasattr(model, 'decision_function_shape'):
+            scheme = 'ovo'
+        else:
+            scheme = 'ovr'
+
+        return cls(coef, model.intercept_, model.classes_, scheme)
+
+
+    def _raw_decision(self, X):
+        """Nilai hyperplane: X @ coef.T + intercept"""
+        return np.asarray(X @ self.coef_.T) + self.intercept_
+
+
+    def decision_function(self, X):
+        """
+        Decision scores (sama dengan model.decision_function)
+
+        Args:
+            X: Vectorized data (sparse matrix)
+
+        Returns:
+            np.ndarray: Decision scores
+        """
+        dec = self._raw_decision(X)
+        if self.scheme == 'binary':
+            return dec.ravel()
+        if self.scheme == 'ovr':
+            return dec
+
+        # OvO -> OvR (votes + confidence yang ditransformasi, seperti sklearn)
+        n_samples = dec.shape[0]
+        votes = np.zeros((n_samples, len(self.classes_)))
+        confidences = np.zeros((n_samples, len(self.classes_)))
+        for k, (i, j) in enumerate(self._pairs):
+            confidences[:, i] += dec[:, k]
+            confidences[:, j] -= dec[:, k]
+            votes[:, i] += dec[:, k] >= 0
+            votes[:, j] += dec[:, k] < 0
+
+        return votes + confidences / (3 * (np.abs(confidences) + 1))
+
+
+    def predict(self, X):
+        """
+        Predict label (identik dengan model.predict)
+
+        Args:
+            X: Vectorized data (sparse matrix)
+
+        Returns:
+            np.ndarray: Predicted labels
+        """
+        dec = self._raw_decision(X)
+        if self.scheme == 'binary':
+            return self.classes_[(dec.ravel() > 0).astype(int)]
+        if self.scheme == 'ovr':
+            return self.classes_[dec.argmax(axis=1)]
+
+        # Voting libsvm: dec > 0 -> kelas i, selain itu kelas j; seri -> index terkecil
+        votes = np.zeros((dec.shape[0], len(self.classes_)), dtype=np.int64)
+        for k, (i, j) in enumerate(self._pairs):
+            positive = dec[:, k] > 0
+            votes[:, i] += positive
+            votes[:, j] += ~positive
+
+        return self.classes_[votes.argmax(axis=1)]
+
+
+    def save(self, path):
+        """Simpan bobot ke file .npz"""
+        np.savez(
+            path,
+            coef=self.coef_,
+            intercept=self.intercept_,
+            classes=self.classes_.astype(str),
+            scheme=np.array(self.scheme)
+        )
+
+
+    @classmethod
+    def load(cls, path):
+        """Load bobot dari file .npz"""
+        with np.load(path) as data:
+            return cls(data['coef'], data['intercept'], data['classes'], str(data['scheme']))
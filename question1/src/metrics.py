@@ -0,0 +1,181 @@
+"""
+Modul untuk instrumentasi latency per tahap
+
+Histogram durasi (bucket ala Prometheus) untuk setiap tahap preprocessing dan
+prediksi. Instrumentasi nonaktif secara default; saat nonaktif, jalur
+prediksi hanya membaca satu flag (metrics.enabled) atau memakai context
+manager no-op yang sudah dibuat sekali.
+
+Contoh:
+    from src.metrics import metrics
+    metrics.enable()
+    ...
+    print(metrics.summary_table())
+"""
+
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+
+import config
+
+# Batas atas bucket dalam detik (100 us sampai 10 s)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+_NOOP = nullcontext()
+
+
+class Histogram:
+    """Histogram durasi dengan bucket tetap (count per bucket, count, sum, max)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # bucket terakhir: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q):
+        """Estimasi quantile (batas atas bucket yang memuat quantile q)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum_seconds': self.sum,
+            'mean_ms': self.sum / self.count * 1000 if self.count else 0.0,
+            'p50_ms': self.quantile(0.5) * 1000,
+            'p90_ms': self.quantile(0.9) * 1000,
+            'p99_ms': self.quantile(0.99) * 1000,
+            'max_ms': self.max * 1000
+        }
+
+
+class _Timer:
+    """Context manager yang mencatat durasi blok ke satu tahap"""
+
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """Kumpulan histogram per tahap (thread-safe)"""
+
+    def __init__(self, enabled=config.METRICS_ENABLED, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def observe(self, stage, seconds):
+        """Catat satu durasi (detik) untuk tahap"""
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def timer(self, stage):
+        """Context manager pencatat durasi; no-op jika instrumentasi nonaktif"""
+        if not self.enabled:
+            return _NOOP
+        return _Timer(self, stage)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Ringkasan semua tahap
+
+        Returns:
+            dict: stage -> {count, sum_seconds, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}
+        """
+        with self._lock:
+            return {stage: h.snapshot() for stage, h in sorted(self._histograms.items())}
+
+    def summary_table(self):
+        """Tabel ringkasan untuk dicetak di console"""
+        lines = [f"{'stage':<28}{'count':>8}{'mean ms':>10}{'p50 ms':>10}"
+                 f"{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+        for stage, s in self.snapshot().items():
+            lines.append(
+                f"{stage:<28}{s['count']:>8}{s['mean_ms']:>10.3f}{s['p50_ms']:>10.3f}"
+                f"{s['p90_ms']:>10.3f}{s['p99_ms']:>10.3f}{s['max_ms']:>10.3f}"
+            )
+        return '\n'.join(lines)
+
+    def to_prometheus(self, extra=None, prefix=config.METRICS_PREFIX):
+        """
+        Dump format teks Prometheus (exposition format 0.0.4)
+
+        Args:
+            extra (list): Metric tambahan (name, type, help, value) tanpa prefix,
+                mis. counter request dan gauge queue dari server
+            prefix (str): Prefix nama metric
+
+        Returns:
+            str: Teks metrics
+        """
+        name = f"{prefix}_stage_seconds"
+        lines = [
+            f"# HELP {name} Durasi per tahap preprocessing/prediksi",
+            f"# TYPE {name} histogram"
+        ]
+        with self._lock:
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+        for metric, metric_type, help_text, value in extra or []:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} {metric_type}")
+            lines.append(f"{prefix}_{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+
+# Registry global yang dipakai preprocessing, MessageClassifier, dan server
+metrics = MetricsRegistry()
@@ -4,11 +4,18 @@ Modul untuk training dan evaluasi model
 """
 
 import os
+import pickle
+import shutil
+import time
+import tracemalloc
 import pandas as pd
 import joblib
+import scipy.sparse as sp
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.svm import SVC
+from sklearn.feature_extraction.text import TfidfVectorizer, HashingVectorizer, TfidfTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.svm import SVC, LinearSVC
+from sklearn.linear_model import SGDClassifier
 from sklearn.preprocessing import LabelEncoder
 from sklearn.utils.class_weight import compute_sample_weight
 from sklearn.metrics import (
@@ -20,8 +27,13 @@ from sklearn.metrics import (
     confusion_matrix,
     ConfusionMatrixDisplay
 )
-import matplotlib.pyplot as plt
 
+from . import registry
+from .bundle import save_bundle
+from .cache import write_model_fingerprint
+from .linear import LinearScorer
+from .preprocessing import preprocess_texts
+from .stage_cache import StageCache
 import config
 
 
@@ -54,37 +66,164 @@ def prepare_data(data_file):
     return X_train, X_test, y_train, y_test
 
 
-def vectorize_text(X_train, X_test):
+FEATURE_BACKENDS = ('tfidf', 'hashing')
+
+
+def build_vectorizer(backend=None, use_idf=None):
+    """
+    Buat vectorizer sesuai feature backend
+    
+    Args:
+        backend (str): 'tfidf' atau 'hashing' (default: config.FEATURE_BACKEND)
+        use_idf (bool): IDF reweighting untuk backend hashing
+            (default: config.HASHING_USE_IDF)
+    
+    Returns:
+        TfidfVectorizer, HashingVectorizer, atau Pipeline (hashing + TfidfTransformer)
     """
-    TF-IDF Vectorization
+    backend = backend or config.FEATURE_BACKEND
+    
+    if backend == 'tfidf':
+        return TfidfVectorizer(
+            max_features=config.TFIDF_MAX_FEATURES,
+            ngram_range=config.TFIDF_NGRAM_RANGE
+        )
+    if backend == 'hashing':
+        use_idf = config.HASHING_USE_IDF if use_idf is None else use_idf
+        if not use_idf:
+            return build_hashing_vectorizer()
+        # Count hashing -> IDF -> l2 norm, sama seperti TfidfVectorizer
+        return Pipeline([
+            ('hashing', build_hashing_vectorizer(norm=None)),
+            ('idf', TfidfTransformer())
+        ])
+    
+    raise ValueError(f"Unknown feature backend: {backend}. Pilih: {', '.join(FEATURE_BACKENDS)}")
+
+
+def hash_texts(hashing_vectorizer, texts, n_jobs=None):
+    """
+    Transform teks dengan HashingVectorizer, paralel per chunk
+    
+    HashingVectorizer stateless, sehingga setiap chunk bisa di-transform di
+    worker terpisah tanpa berbagi vocabulary, lalu hasilnya di-stack.
+    
+    Args:
+        hashing_vectorizer (HashingVectorizer): Vectorizer
+        texts: Kumpulan teks
+        n_jobs (int): Jumlah worker (default: config.FEATURE_N_JOBS)
+    
+    Returns:
+        scipy.sparse.csr_matrix: Feature matrix
+    """
+    n_jobs = n_jobs or config.FEATURE_N_JOBS
+    texts = list(texts)
+    if n_jobs == 1 or len(texts) < 2 * config.FEATURE_CHUNKSIZE:
+        return hashing_vectorizer.transform(texts)
+    
+    from joblib import Parallel, delayed
+    
+    chunks = [
+        texts[i:i + config.FEATURE_CHUNKSIZE]
+        for i in range(0, len(texts), config.FEATURE_CHUNKSIZE)
+    ]
+    matrices = Parallel(n_jobs=n_jobs)(
+        delayed(hashing_vectorizer.transform)(chunk) for chunk in chunks
+    )
+    return sp.vstack(matrices, format='csr')
+
+
+def vectorize_text(X_train, X_test, backend=None):
+    """
+    Vectorization (TF-IDF atau feature hashing)
     
     Args:
         X_train: Train text data
         X_test: Test text data
+        backend (str): Feature backend (default: config.FEATURE_BACKEND)
     
     Returns:
         tuple: vectorizer, X_train_tfidf, X_test_tfidf
     """
-    vectorizer = TfidfVectorizer(
-        max_features=config.TFIDF_MAX_FEATURES,
-        ngram_range=config.TFIDF_NGRAM_RANGE
-    )
+    vectorizer = build_vectorizer(backend)
+    
+    if isinstance(vectorizer, TfidfVectorizer):
+        X_train_tfidf = vectorizer.fit_transform(X_train)
+        X_test_tfidf = vectorizer.transform(X_test)
+    else:
+        # Hashing tidak perlu fit, hanya tahap IDF (jika ada) yang di-fit
+        is_pipeline = isinstance(vectorizer, Pipeline)
+        hashing = vectorizer.named_steps['hashing'] if is_pipeline else vectorizer
+        X_train_tfidf = hash_texts(hashing, X_train)
+        X_test_tfidf = hash_texts(hashing, X_test)
+        if is_pipeline:
+            idf = vectorizer.named_steps['idf']
+            X_train_tfidf = idf.fit_transform(X_train_tfidf)
+            X_test_tfidf = idf.transform(X_test_tfidf)
+    
+    print(f"{type(vectorizer).__name__} features shape: {X_train_tfidf.shape}")
     
-    X_train_tfidf = vectorizer.fit_transform(X_train)
-    X_test_tfidf = vectorizer.transform(X_test)
+    return vectorizer, X_train_tfidf, X_test_tfidf
+
+
+def vectorizer_size(vectorizer):
+    """Ukuran vectorizer ter-pickle (bytes), proxy memory state yang disalin ke worker"""
+    return len(pickle.dumps(vectorizer, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+TRAIN_BACKENDS = {
+    'svc': 'SVM (Support Vector Machine)',
+    'linearsvc': 'Linear SVM (LinearSVC)',
+    'sgd': 'Linear SVM (SGDClassifier, hinge loss)'
+}
+
+
+def build_model(backend=None):
+    """
+    Buat model sesuai training backend
     
-    print(f"TF-IDF features shape: {X_train_tfidf.shape}")
+    Args:
+        backend (str): 'svc', 'linearsvc', atau 'sgd' (default: config.TRAIN_BACKEND)
     
-    return vectorizer, X_train_tfidf, X_test_tfidf
+    Returns:
+        model: Untrained sklearn classifier
+    """
+    backend = backend or config.TRAIN_BACKEND
+    
+    if backend == 'svc':
+        return SVC(
+            kernel=config.SVM_KERNEL,
+            C=config.SVM_C,
+            class_weight=config.SVM_CLASS_WEIGHT,
+            probability=config.SVM_PROBABILITY,
+            random_state=config.RANDOM_STATE
+        )
+    if backend == 'linearsvc':
+        return LinearSVC(
+            C=config.SVM_C,
+            class_weight=config.SVM_CLASS_WEIGHT,
+            dual='auto',
+            random_state=config.RANDOM_STATE
+        )
+    if backend == 'sgd':
+        return SGDClassifier(
+            loss='hinge',
+            alpha=config.SGD_ALPHA,
+            class_weight=config.SVM_CLASS_WEIGHT,
+            random_state=config.RANDOM_STATE
+        )
+    
+    raise ValueError(f"Unknown training backend: {backend}. Pilih: {', '.join(TRAIN_BACKENDS)}")
 
 
-def train_svm_model(X_train_tfidf, y_train):
+def train_svm_model(X_train_tfidf, y_train, backend=None):
     """
     Melatih mode SVM dengan balanced class weight
     
     Args:
         X_train_tfidf: Vectorized training data
         y_train: Training labels
+        backend (str): Training backend (default: config.TRAIN_BACKEND)
     
     Returns:
         model: Trained SVM model
@@ -93,20 +232,84 @@ def train_svm_model(X_train_tfidf, y_train):
     sample_weights = compute_sample_weight(class_weight='balanced', y=y_train)
     
     # Train model SVM
-    svm_model = SVC(
-        kernel=config.SVM_KERNEL,
-        class_weight=config.SVM_CLASS_WEIGHT,
-        random_state=config.RANDOM_STATE
-    )
+    svm_model = build_model(backend)
     
-    print("Training SVM model...")
+    print(f"Training {type(svm_model).__name__} model...")
     svm_model.fit(X_train_tfidf, y_train, sample_weight=sample_weights)
     print("Training completed!")
     
     return svm_model
 
 
-def evaluate_model(model, X_test_tfidf, y_test):
+def train_with_stats(X_train_tfidf, y_train, backend=None, measure_memory=None):
+    """
+    Melatih model sambil mengukur waktu dan memory
+    
+    Train time diukur pada fit tanpa tracing. Jika measure_memory aktif, peak
+    memory diukur dengan tracemalloc (alokasi Python/NumPy selama training)
+    pada fit kedua yang terpisah, karena tracemalloc memperlambat setiap
+    alokasi. Peak RSS process (termasuk memory internal libsvm/liblinear)
+    dicatat jika modul resource tersedia (tidak ada di Windows).
+    
+    Args:
+        X_train_tfidf: Vectorized training data
+        y_train: Training labels
+        backend (str): Training backend (default: config.TRAIN_BACKEND)
+        measure_memory (bool): Ukur peak memory dengan tracemalloc
+            (default: config.TRAIN_MEASURE_MEMORY)
+    
+    Returns:
+        tuple: model, dict train stats (backend, train_time, memory_mode,
+            train_peak_mem_mb (None jika tidak diukur), process_peak_rss_mb
+            (None jika tidak tersedia))
+    """
+    backend = backend or config.TRAIN_BACKEND
+    if measure_memory is None:
+        measure_memory = config.TRAIN_MEASURE_MEMORY
+    
+    start = time.perf_counter()
+    model = train_svm_model(X_train_tfidf, y_train, backend)
+    train_time = time.perf_counter() - start
+    
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            train_svm_model(X_train_tfidf, y_train, backend)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    
+    try:
+        import resource
+    except ImportError:
+        # Modul resource hanya ada di Unix
+        peak_rss = None
+    else:
+        # ru_maxrss dalam KB di Linux
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    
+    return model, {
+        'backend': backend,
+        'train_time': train_time,
+        'memory_mode': 'tracemalloc' if measure_memory else ('rss' if peak_rss is not None else None),
+        'train_peak_mem_mb': peak / (1024 * 1024) if peak is not None else None,
+        'process_peak_rss_mb': peak_rss
+    }
+
+
+def format_train_memory(train_stats):
+    """Ringkasan memory training untuk dicetak"""
+    if train_stats['process_peak_rss_mb'] is None:
+        rss = "process peak RSS tidak tersedia"
+    else:
+        rss = f"process peak RSS {train_stats['process_peak_rss_mb']:.1f} MB"
+    if train_stats['train_peak_mem_mb'] is None:
+        return f"tidak diukur, {rss} (aktifkan dengan --measure-memory)"
+    return f"{train_stats['train_peak_mem_mb']:.1f} MB (tracemalloc pada fit terpisah, {rss})"
+
+
+def evaluate_model(model, X_test_tfidf, y_test, train_stats=None):
     """
     Evaluasi performa model
     
@@ -114,6 +317,7 @@ def evaluate_model(model, X_test_tfidf, y_test):
         model: Trained model
         X_test_tfidf: Vectorized test data
         y_test: Test labels
+        train_stats (dict): Waktu dan memory training (dari train_with_stats)
     
     Returns:
         dict: Evaluation metrics
@@ -134,6 +338,10 @@ def evaluate_model(model, X_test_tfidf, y_test):
     print(f"Precision: {precision:.4f}")
     print(f"Recall:    {recall:.4f}")
     print(f"F1 Score:  {f1:.4f}")
+    if train_stats:
+        print(f"Backend:   {train_stats['backend']}")
+        print(f"Train time: {train_stats['train_time']:.3f}s (fit tanpa tracing)")
+        print(f"Train peak memory: {format_train_memory(train_stats)}")
     print(f"\n{classification_report(y_test, y_pred)}")
     
     metrics = {
@@ -142,6 +350,8 @@ def evaluate_model(model, X_test_tfidf, y_test):
         'recall': recall,
         'f1_score': f1
     }
+    if train_stats:
+        metrics.update(train_stats)
     
     return y_pred, metrics
 
@@ -155,6 +365,8 @@ def plot_confusion_matrix(y_test, y_pred, label_encoder):
         y_pred: Predicted labels
         label_encoder: LabelEncoder object
     """
+    import matplotlib.pyplot as plt
+    
     labels = sorted(list(set(y_test) | set(y_pred)))
     cm = confusion_matrix(y_test, y_pred, labels=labels)
     
@@ -171,57 +383,274 @@ def plot_confusion_matrix(y_test, y_pred, label_encoder):
 
 def save_models(model, vectorizer, label_encoder):
     """
-    Save trained model, vectorizer, dan label encoder
+    Save trained model, vectorizer, dan label encoder sebagai versi baru di registry
+    
+    Artifact ditulis ke direktori staging, lalu dijadikan versi immutable dan
+    pointer CURRENT diganti secara atomic, sehingga consumer tidak pernah
+    membaca artifact yang setengah tertulis.
     
     Args:
         model: Trained SVM model
         vectorizer: TF-IDF vectorizer
         label_encoder: Label encoder
-    """
-    joblib.dump(model, config.SVM_MODEL_FILE)
-    joblib.dump(vectorizer, config.VECTORIZER_FILE)
-    joblib.dump(label_encoder, config.LABEL_ENCODER_FILE)
     
-    print(f"\nModels saved:")
-    print(f"- SVM model: {config.SVM_MODEL_FILE}")
-    print(f"- Vectorizer: {config.VECTORIZER_FILE}")
-    print(f"- Label encoder: {config.LABEL_ENCODER_FILE}")
+    Returns:
+        str: Id versi model baru
+    """
+    staging, paths = registry.stage_version()
+    try:
+        joblib.dump(model, paths['model'])
+        joblib.dump(vectorizer, paths['vectorizer'])
+        joblib.dump(label_encoder, paths['label_encoder'])
+        
+        # Export bobot linear untuk fast path inferensi
+        try:
+            scorer = LinearScorer.from_model(model)
+            scorer.save(paths['linear_weights'])
+        except AttributeError:
+            # Model non-linear, tanpa bobot linear dan bundle
+            scorer = None
+        
+        # Bundle satu file (vocabulary, IDF, bobot, classes) untuk memory-map
+        if scorer is not None:
+            try:
+                save_bundle(paths['bundle'], vectorizer, scorer)
+            except ValueError as e:
+                print(f"Model bundle dilewati: {e}")
+                if os.path.exists(paths['bundle']):
+                    os.remove(paths['bundle'])
+        
+        # Fingerprint model baru, cache prediksi dari model lama otomatis tidak berlaku
+        fingerprint = write_model_fingerprint(
+            [paths['model'], paths['vectorizer'], paths['label_encoder'], paths['bundle']],
+            version_file=paths['version']
+        )
+        version = registry.commit_version(staging, fingerprint)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    
+    paths = registry.artifact_paths(version)
+    print(f"\nModels saved (version {version}):")
+    print(f"- SVM model: {paths['model']}")
+    print(f"- Vectorizer: {paths['vectorizer']}")
+    print(f"- Label encoder: {paths['label_encoder']}")
+    if os.path.exists(paths['linear_weights']):
+        print(f"- Linear weights: {paths['linear_weights']}")
+    if os.path.exists(paths['bundle']):
+        print(f"- Model bundle: {paths['bundle']}")
+    print(f"- Model version: {fingerprint}")
+    
+    return version
 
 
-def train_pipeline(data_file):
+def train_pipeline(data_file, backend=None, feature_backend=None, measure_memory=None):
     """
     Training pipeline
     
     Args:
         data_file (str): Path ke cleaned data file
+        backend (str): Training backend (default: config.TRAIN_BACKEND)
+        feature_backend (str): Feature backend (default: config.FEATURE_BACKEND)
+        measure_memory (bool): Ukur peak memory training dengan tracemalloc
+            (default: config.TRAIN_MEASURE_MEMORY)
     
     Returns:
         tuple: model, vectorizer, label_encoder, metrics
     """
     print("Starting training pipeline...\n")
     
-    # 1. Prepare data
-    X_train, X_test, y_train, y_test = prepare_data(data_file)
+    # 1. Prepare data (split di-cache berdasarkan isi data file + config)
+    cache = StageCache()
+    split_key, splits = cache.split(data_file, prepare_data)
+    X_train, X_test, y_train, y_test = splits
     
-    # 2. Label encoding
-    df = pd.read_csv(data_file)
+    # 2. Label encoding (dari hasil split, tanpa membaca data file ulang)
     le = LabelEncoder()
-    le.fit(df['label'])
+    le.fit(pd.concat([y_train, y_test]))
     
-    # 3. Vectorize text
-    vectorizer, X_train_tfidf, X_test_tfidf = vectorize_text(X_train, X_test)
+    # 3. Vectorize text (vectorizer + feature matrix di-cache)
+    vectorizer, X_train_tfidf, X_test_tfidf = cache.features(
+        split_key, splits, vectorize_text, feature_backend
+    )
+    print(f"Stage cache: {cache.summary()}")
     
     # 4. Train model
-    model = train_svm_model(X_train_tfidf, y_train)
+    model, train_stats = train_with_stats(
+        X_train_tfidf, y_train, backend, measure_memory
+    )
     
     # 5. Evaluasi model
-    y_pred, metrics = evaluate_model(model, X_test_tfidf, y_test)
+    y_pred, metrics = evaluate_model(model, X_test_tfidf, y_test, train_stats)
+    metrics['feature_backend'] = feature_backend or config.FEATURE_BACKEND
     
     # 6. Plot confusion matrix
     plot_confusion_matrix(y_test, y_pred, le)
     
     # 7. Save model
-    save_models(model, vectorizer, le)
+    metrics['version'] = save_models(model, vectorizer, le)
+    
+    return model, vectorizer, le, metrics
+
+
+def build_hashing_vectorizer(norm='l2'):
+    """
+    HashingVectorizer stateless (feature backend hashing dan incremental training)
+    
+    Tidak ada vocabulary yang di-fit, sehingga data baru bisa langsung
+    di-transform tanpa refit dan fitur lama tetap konsisten.
+    
+    Args:
+        norm (str): Normalisasi baris (None jika diikuti TfidfTransformer)
+    
+    Returns:
+        HashingVectorizer: Vectorizer (n-gram sama dengan TF-IDF)
+    """
+    return HashingVectorizer(
+        n_features=config.HASHING_N_FEATURES,
+        ngram_range=config.TFIDF_NGRAM_RANGE,
+        alternate_sign=False,
+        norm=norm
+    )
+
+
+def build_incremental_model():
+    """SGDClassifier (hinge loss) yang mendukung partial_fit"""
+    return SGDClassifier(
+        loss='hinge',
+        alpha=config.SGD_ALPHA,
+        random_state=config.RANDOM_STATE
+    )
+
+
+def load_incremental_model():
+    """
+    Load model tersimpan jika kompatibel dengan incremental update
+    
+    Kompatibel artinya model mendukung partial_fit dan vectorizer adalah
+    HashingVectorizer dengan jumlah fitur sesuai config. class_weight model
+    (mis. 'balanced' dari --backend sgd) dikosongkan, karena partial_fit
+    memakai sample_weight per batch.
+    
+    Returns:
+        tuple: model, vectorizer (None, None jika tidak ada / tidak kompatibel)
+    """
+    paths = registry.artifact_paths()
+    if not (os.path.exists(paths['model']) and os.path.exists(paths['vectorizer'])):
+        return None, None
+    
+    model = joblib.load(paths['model'])
+    vectorizer = joblib.load(paths['vectorizer'])
+    if (hasattr(model, 'partial_fit') and isinstance(vectorizer, HashingVectorizer)
+            and vectorizer.n_features == config.HASHING_N_FEATURES):
+        # class_weight 'balanced' gagal untuk batch tanpa semua kelas dan akan
+        # menggandakan bobot dari compute_sample_weight
+        if getattr(model, 'class_weight', None) is not None:
+            model.set_params(class_weight=None)
+        return model, vectorizer
+    
+    return None, None
+
+
+def bootstrap_incremental_model(data_file):
+    """
+    Latih model incremental awal dari data train cleaned data
+    
+    Hanya data train hasil split yang sama dengan train/evaluate (stage cache)
+    yang dipakai, sehingga data test tetap tidak pernah dilihat model.
+    
+    Args:
+        data_file (str): Path ke cleaned data file (kolom question, label)
+    
+    Returns:
+        tuple: model, vectorizer
+    """
+    _, (X_train, _, y_train, _) = StageCache().split(data_file, prepare_data)
+    vectorizer = build_hashing_vectorizer()
+    X = hash_texts(vectorizer, X_train)
+    
+    model = build_incremental_model()
+    sample_weights = compute_sample_weight(class_weight='balanced', y=y_train)
+    model.fit(X, y_train, sample_weight=sample_weights)
+    print(f"Bootstrap model dari data train {data_file} ({len(X_train)} rows)")
+    
+    return model, vectorizer
+
+
+def update_pipeline(new_data_file, base_data_file=None, bootstrap=False):
+    """
+    Incremental training: update model dengan data berlabel baru (partial_fit)
+    
+    Hanya baris baru yang di-preprocess dan di-vectorize. Jika belum ada model
+    yang kompatibel, model awal dilatih dulu dari data train base_data_file.
+    Model aktif yang tidak kompatibel (mis. hasil train_pipeline dengan TF-IDF)
+    hanya diganti jika bootstrap=True.
+    
+    Args:
+        new_data_file (str): CSV berlabel baru (kolom question, label; teks mentah)
+        base_data_file (str): Cleaned data untuk bootstrap (default: config.PROCESSED_DATA)
+        bootstrap (bool): Izinkan mengganti model aktif yang tidak kompatibel
+            dengan model incremental baru
+    
+    Returns:
+        tuple: model, vectorizer, label_encoder, metrics
+    
+    Raises:
+        ValueError: Jika kolom tidak lengkap, ada label di luar kategori model,
+            atau model aktif tidak kompatibel dan bootstrap=False
+    """
+    print("Starting incremental update...\n")
+    
+    # 1. Load data baru dan preprocess (hanya baris baru)
+    df = pd.read_csv(new_data_file)
+    missing = {'question', 'label'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan di {new_data_file}: {', '.join(sorted(missing))}")
+    df = df.dropna(subset=['question', 'label']).drop_duplicates()
+    
+    # 2. Load model kompatibel atau bootstrap
+    model, vectorizer = load_incremental_model()
+    bootstrapped = model is None
+    if bootstrapped:
+        if os.path.exists(registry.artifact_paths()['model']) and not bootstrap:
+            raise ValueError(
+                "Model aktif bukan model incremental (SGD + HashingVectorizer). "
+                "Gunakan --bootstrap untuk menggantinya dengan model incremental baru"
+            )
+        model, vectorizer = bootstrap_incremental_model(base_data_file or config.PROCESSED_DATA)
+    
+    texts = preprocess_texts(df['question'])
+    print(f"New labeled rows: {len(df)}")
+    
+    unknown = set(df['label']) - set(model.classes_)
+    if unknown:
+        raise ValueError(f"Label tidak dikenal: {', '.join(sorted(map(str, unknown)))}")
+    
+    metrics = {'rows': len(df), 'bootstrapped': bootstrapped, 'accuracy_before': None}
+    if len(df) == 0:
+        print("Tidak ada data baru, model tidak diubah")
+        return model, vectorizer, None, metrics
+    
+    # 3. Vectorize dan partial_fit
+    X_new = hash_texts(vectorizer, texts)
+    
+    # Akurasi pada data baru sebelum update (estimasi performa di data terbaru)
+    metrics['accuracy_before'] = accuracy_score(df['label'], model.predict(X_new))
+    
+    start = time.perf_counter()
+    sample_weights = compute_sample_weight(class_weight='balanced', y=df['label'])
+    model.partial_fit(X_new, df['label'], sample_weight=sample_weights)
+    metrics['update_time'] = time.perf_counter() - start
+    metrics['accuracy_after'] = accuracy_score(df['label'], model.predict(X_new))
+    
+    print(f"Accuracy on new rows (before update): {metrics['accuracy_before']:.4f}")
+    print(f"Accuracy on new rows (after update):  {metrics['accuracy_after']:.4f}")
+    print(f"Update time: {metrics['update_time']:.3f}s")
+    
+    # 4. Save model
+    le = LabelEncoder()
+    le.fit(model.classes_)
+    metrics['version'] = save_models(model, vectorizer, le)
     
     return model, vectorizer, le, metrics
 
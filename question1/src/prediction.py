@@ -2,34 +2,200 @@
 Modul untuk prediksi menggunakan trained model
 """
 
-import joblib
-from .preprocessing import preprocess_text
+import os
+import threading
+from collections import namedtuple
+
+from . import registry
+from .bundle import load_bundle
+from .cache import PredictionCache, read_model_fingerprint
+from .linear import LinearScorer
+from .metrics import metrics
+from .preprocessing import preprocess_texts, stem_cache
 import config
 
+# Snapshot model yang sedang aktif. Diganti utuh saat reload, sehingga
+# prediksi yang sedang berjalan tetap memakai satu versi yang konsisten.
+ModelState = namedtuple(
+    'ModelState', ['model', 'vectorizer', 'label_encoder', 'fingerprint', 'version']
+)
+EMPTY_STATE = ModelState(None, None, None, None, None)
+
 
 class MessageClassifier:
     """Class untuk klasifikasi pesan cutomer"""
     
-    def __init__(self):
-        """Inisialisasi dengan trained models"""
-        self.model = None
-        self.vectorizer = None
-        self.label_encoder = None
+    def __init__(self, cache=None, auto_reload=config.MODEL_AUTO_RELOAD):
+        """
+        Inisialisasi dengan trained models
+
+        Args:
+            cache (PredictionCache): Cache hasil prediksi (default: dibuat
+                sesuai config.PREDICTION_CACHE_ENABLED)
+            auto_reload (bool): Pantau registry di background thread dan
+                swap ke versi model baru tanpa restart
+        """
+        self._state = EMPTY_STATE
+        self._reload_lock = threading.Lock()
+        self._watcher = None
+        self._stop_watching = threading.Event()
+        if cache is None and config.PREDICTION_CACHE_ENABLED:
+            cache = PredictionCache()
+        self.cache = cache
         self.load_models()
-        
+        if auto_reload:
+            self.start_watching()
+    
+    
+    @property
+    def model(self):
+        return self._state.model
+    
+    
+    @property
+    def vectorizer(self):
+        return self._state.vectorizer
+    
+    
+    @property
+    def label_encoder(self):
+        return self._state.label_encoder
+    
+    
+    @property
+    def model_fingerprint(self):
+        return self._state.fingerprint
+    
+    
+    @property
+    def model_version(self):
+        return self._state.version
+    
     
     def load_models(self):
-        """Load trained model, vectorizer, dan label encoder"""
+        """Load trained model, vectorizer, dan label encoder (versi aktif di registry)"""
         try:
-            self.model = joblib.load(config.SVM_MODEL_FILE)
-            self.vectorizer = joblib.load(config.VECTORIZER_FILE)
-            self.label_encoder = joblib.load(config.LABEL_ENCODER_FILE)
+            self._swap_state(self._load_state(registry.current_version()))
             print("Model load success")
+            
+            if self.cache is not None and config.PREDICTION_CACHE_PERSIST:
+                self.cache.load(config.PREDICTION_CACHE_FILE)
+            
+            # Warm-up stem cache dari hasil preprocessing sebelumnya
+            if config.STEM_CACHE_PERSIST:
+                stem_cache.load(config.STEM_CACHE_FILE)
         except FileNotFoundError as e:
             print(f"Error loading model: {e}")
             print("Train model dengan: python main.py --mode train")
     
     
+    @classmethod
+    def _load_state(cls, version):
+        """
+        Load artifact satu versi model menjadi ModelState
+
+        Raises:
+            FileNotFoundError: Jika artifact tidak ada
+        """
+        paths = registry.artifact_paths(version)
+        if cls._use_bundle(paths):
+            vectorizer, model, label_encoder = load_bundle(
+                paths['bundle'],
+                verify=config.BUNDLE_VERIFY_CHECKSUM
+            )
+        else:
+            import joblib
+            
+            if cls._use_linear_fast_path(paths):
+                model = LinearScorer.load(paths['linear_weights'])
+            else:
+                model = joblib.load(paths['model'])
+            vectorizer = joblib.load(paths['vectorizer'])
+            label_encoder = joblib.load(paths['label_encoder'])
+        
+        return ModelState(
+            model, vectorizer, label_encoder,
+            read_model_fingerprint(paths['version']), version
+        )
+    
+    
+    def _swap_state(self, state):
+        """Aktifkan snapshot model baru, cache prediksi ikut fingerprint baru"""
+        # Fingerprint diganti sebelum snapshot dipublikasikan: prediksi dengan
+        # model baru tidak membaca entry model lama, dan entry dari prediksi
+        # model lama yang masih berjalan ditolak oleh cache.put
+        if self.cache is not None:
+            self.cache.set_fingerprint(state.fingerprint)
+        self._state = state
+    
+    
+    def reload(self):
+        """
+        Cek versi aktif di registry dan swap jika berbeda
+
+        Versi baru di-load dulu di thread pemanggil; prediksi yang sedang
+        berjalan tetap memakai snapshot lama sampai selesai.
+
+        Returns:
+            bool: True jika model diganti
+        """
+        with self._reload_lock:
+            version = registry.current_version()
+            if version is None or version == self._state.version:
+                return False
+            
+            state = self._load_state(version)
+            self._swap_state(state)
+            print(f"Model reloaded: version {version}")
+            return True
+    
+    
+    def start_watching(self, interval=config.MODEL_RELOAD_INTERVAL):
+        """Jalankan background thread yang memanggil reload secara berkala"""
+        if self._watcher is not None:
+            return
+        
+        def watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload()
+                except (OSError, ValueError) as e:
+                    # Versi belum lengkap / rusak, coba lagi di interval berikutnya
+                    print(f"Model reload gagal: {e}")
+        
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=watch, name='model-watcher', daemon=True)
+        self._watcher.start()
+    
+    
+    def stop_watching(self):
+        """Hentikan background thread reload"""
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
+    
+    
+    @staticmethod
+    def _use_bundle(paths):
+        """Bundle dipakai jika dipilih di config, file ada, dan tidak butuh probabilitas"""
+        return (
+            config.MODEL_FORMAT == 'bundle'
+            and not config.SVM_PROBABILITY
+            and os.path.exists(paths['bundle'])
+        )
+    
+    
+    @staticmethod
+    def _use_linear_fast_path(paths):
+        """Fast path dipakai jika aktif, bobot linear ada, dan tidak butuh probabilitas"""
+        return (
+            config.LINEAR_FAST_PATH
+            and not config.SVM_PROBABILITY
+            and os.path.exists(paths['linear_weights'])
+        )
+    
+    
     def predict(self, text):
         """
         Predict kategori untuk teks input
@@ -40,19 +206,7 @@ class MessageClassifier:
         Returns:
             str: Predicted category
         """
-        if not all([self.model, self.vectorizer, self.label_encoder]):
-            raise ValueError("Model not loaded. Train or load model first")
-        
-        # Preprocess
-        preprocessed_text = preprocess_text(text)
-        
-        # Vectorize
-        text_vectorized = self.vectorizer.transform([preprocessed_text])
-        
-        # Predict
-        prediction = self.model.predict(text_vectorized)[0]
-        
-        return prediction
+        return self.predict_many([text])[0]
 
     
     def predict_proba(self, text):
@@ -68,21 +222,182 @@ class MessageClassifier:
         if not hasattr(self.model, 'decision_function'):
             return None
         
+        return self.classify(text)['scores']
+    
+    
+    @staticmethod
+    def _scores_to_dict(scores, label_encoder):
+        """Mapping decision scores satu sampel ke dictionary per kategori"""
+        result = {}
+        for i, label in enumerate(label_encoder.classes_):
+            result[label] = scores[i] if len(scores) > 1 else scores
+        
+        return result
+    
+    
+    def classify(self, text, with_proba=False):
+        """
+        Predict kategori, decision scores, dan (opsional) probabilitas
+
+        Preprocessing dan vectorize hanya dijalankan sekali untuk semua output.
+
+        Args:
+            text (str): Input text
+            with_proba (bool): Sertakan probabilitas terkalibrasi jika model
+                mendukung predict_proba (config.SVM_PROBABILITY=True)
+        
+        Returns:
+            dict: {'text', 'prediction', 'scores'} dan 'probabilities'
+                jika with_proba=True
+        """
+        return self.predict_many([text], with_scores=True, with_proba=with_proba)[0]
+    
+    
+    def predict_many(self, texts, with_scores=False, with_proba=False):
+        """
+        Predict kategori untuk banyak teks sekaligus
+
+        Semua teks di-preprocess, di-vectorize dalam satu matrix, lalu
+        predict (dan decision_function) dijalankan sekali untuk seluruh matrix.
+
+        Args:
+            texts (list): Kumpulan teks input
+            with_scores (bool): Sertakan decision scores per kategori
+            with_proba (bool): Sertakan probabilitas per kategori (None jika
+                model tidak mendukung predict_proba)
+        
+        Returns:
+            list: Predicted category per teks, atau list of dict
+                {'text', 'prediction', 'scores'} jika with_scores=True
+        """
+        with metrics.timer('predict.total'):
+            return self._predict_many(texts, with_scores, with_proba)
+    
+    
+    def _predict_many(self, texts, with_scores, with_proba):
+        """Implementasi predict_many (lihat predict_many)"""
+        # Satu snapshot untuk seluruh batch, aman terhadap reload di tengah jalan
+        state = self._state
+        if not all([state.model, state.vectorizer, state.label_encoder]):
+            raise ValueError("Model not loaded. Train or load model first")
+        
+        texts = list(texts)
+        if not texts:
+            return []
+        
         # Preprocess
-        processed_text = preprocess_text(text)
+        with metrics.timer('predict.preprocess'):
+            processed_texts = preprocess_texts(texts)
+        
+        if self.cache is None:
+            entries = self._score(state, processed_texts, with_scores or with_proba, with_proba)
+        else:
+            entries = self._score_cached(state, processed_texts, with_proba)
+        
+        if not (with_scores or with_proba):
+            return [entry['prediction'] for entry in entries]
+        
+        results = []
+        for text, entry in zip(texts, entries):
+            scores = entry['scores']
+            result = {
+                'text': text,
+                'prediction': entry['prediction'],
+                'scores': dict(scores) if scores is not None else None
+            }
+            if with_proba:
+                result['probabilities'] = entry['probabilities']
+            results.append(result)
+        
+        return results
+    
+    
+    def _score(self, state, processed_texts, with_scores, with_proba):
+        """
+        Vectorize dan scoring teks yang sudah di-preprocess (satu matrix)
+
+        Args:
+            state (ModelState): Snapshot model yang dipakai
+
+        Returns:
+            list: dict {'prediction', 'scores'} (+ 'probabilities') per teks
+        """
+        model = state.model
         
         # Vectorize
-        text_vectorized = self.vectorizer.transform([processed_text])
+        with metrics.timer('predict.vectorize'):
+            texts_vectorized = state.vectorizer.transform(processed_texts)
         
-        # Get decision scores
-        scores = self.model.decision_function(text_vectorized)[0]
+        # Predict
+        with metrics.timer('predict.score'):
+            predictions = model.predict(texts_vectorized)
+            
+            if with_scores and hasattr(model, 'decision_function'):
+                scores = [
+                    self._scores_to_dict(row, state.label_encoder)
+                    for row in model.decision_function(texts_vectorized)
+                ]
+            else:
+                scores = [None] * len(processed_texts)
         
-        # Create result dictionary
-        result = {}
-        for i, label in enumerate(self.label_encoder.classes_):
-            result[label] = scores[i] if len(scores) > 1 else scores
+        entries = [
+            {'prediction': pred, 'scores': score}
+            for pred, score in zip(predictions, scores)
+        ]
         
-        return result
+        if with_proba:
+            if hasattr(model, 'predict_proba'):
+                with metrics.timer('predict.proba'):
+                    probabilities = model.predict_proba(texts_vectorized)
+                for entry, row in zip(entries, probabilities):
+                    entry['probabilities'] = dict(zip(model.classes_, row))
+            else:
+                for entry in entries:
+                    entry['probabilities'] = None
+        
+        return entries
+    
+    
+    def _score_cached(self, state, processed_texts, with_proba):
+        """
+        Scoring dengan cache: hanya teks yang belum ada di cache yang
+        di-vectorize dan di-score (sekali per teks unik)
+        """
+        entries = [None] * len(processed_texts)
+        missing = {}  # key -> posisi di batch
+        with metrics.timer('predict.cache_lookup'):
+            for i, key in enumerate(processed_texts):
+                if key in missing:
+                    # Duplikat dalam batch: ikut hasil scoring kemunculan pertama
+                    missing[key].append(i)
+                    continue
+                entry = self.cache.get(key)
+                if entry is None or (with_proba and 'probabilities' not in entry):
+                    missing[key] = [i]
+                else:
+                    entries[i] = entry
+        
+        if missing:
+            computed = self._score(state, list(missing), True, with_proba)
+            for (key, positions), entry in zip(missing.items(), computed):
+                self.cache.put(key, entry, state.fingerprint)
+                for i in positions:
+                    entries[i] = entry
+            # Duplikat dalam batch tidak di-score ulang, dihitung sebagai hit
+            self.cache.record_hits(sum(len(positions) - 1 for positions in missing.values()))
+        
+        return entries
+    
+    
+    def cache_stats(self):
+        """Statistik cache prediksi (None jika cache tidak aktif)"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    
+    def save_cache(self):
+        """Simpan cache prediksi ke disk jika persistence aktif"""
+        if self.cache is not None and config.PREDICTION_CACHE_PERSIST:
+            self.cache.save(config.PREDICTION_CACHE_FILE)
     
     
 def predict_category(text):
@@ -104,22 +419,18 @@ def predict_batch(texts):
     Function untuk prediksi batch input
 
     Args:
-        texts (str): Input text
+        texts (list): Input texts
     
     Returns:
         list: List of prediction
     """
     classifier = MessageClassifier()
-    predictions = []
+    predictions = classifier.predict_many(texts)
     
-    for text in texts:
-        pred = classifier.predict(text)
-        predictions.append({
-            'text': text,
-            'prediction': pred
-        })
-    
-    return predictions
+    return [
+        {'text': text, 'prediction': pred}
+        for text, pred in zip(texts, predictions)
+    ]
 
 
 if __name__ == "__main__":
@@ -2,47 +2,314 @@
 Module untuk preprocessing data
 """
 
-import pandas as pd
+import os
+import pickle
 import re
 import string
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from Sastrawi.Dictionary.ArrayDictionary import ArrayDictionary
+from Sastrawi.Stemmer.Stemmer import Stemmer
 from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+from Sastrawi.Stemmer.Filter import TextNormalizer
+from Sastrawi.StopWordRemover.StopWordRemover import StopWordRemover
 from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
 
-# Initialisasi Sastrawi
-factory_sw = StopWordRemoverFactory()
-stopword_remover = factory_sw.create_stop_word_remover()
+from .metrics import metrics
+import config
 
-factory_stem = StemmerFactory()
-stemmer = factory_stem.create_stemmer()
+# pandas/numpy di-import di dalam fungsi yang membutuhkan (clean_data dkk.)
+# agar prediksi single text tidak ikut menanggung waktu import-nya.
+
+# Objek Sastrawi dibuat saat pertama dipakai (lihat get_stemmer/get_stopword_remover)
+_stemmer = None
+_stopword_remover = None
+
+
+class SetDictionary(ArrayDictionary):
+    """
+    ArrayDictionary dengan lookup O(1)
+
+    ArrayDictionary bawaan Sastrawi menyimpan kata dalam list, sehingga setiap
+    contains() men-scan ~30 ribu kata dasar. Hasil lookup identik.
+    """
+
+    def __init__(self, words=None):
+        self._word_set = set()
+        super().__init__(words)
+
+    def add(self, word):
+        super().add(word)
+        if word and word.strip() != '':
+            self._word_set.add(word)
+
+    def contains(self, word):
+        return word in self._word_set
+
+
+def get_stemmer():
+    """Stemmer Sastrawi tanpa cache bawaan (unbounded), cache diatur oleh StemCache"""
+    global _stemmer
+    if _stemmer is None:
+        _stemmer = Stemmer(SetDictionary(StemmerFactory().get_words()))
+    return _stemmer
+
+
+def get_stopword_remover():
+    """Stopword remover Sastrawi"""
+    global _stopword_remover
+    if _stopword_remover is None:
+        _stopword_remover = StopWordRemover(SetDictionary(StopWordRemoverFactory().get_stop_words()))
+    return _stopword_remover
+
+
+class StemCache:
+    """
+    Cache stemming per token dengan LRU eviction
+
+    Sastrawi lambat untuk setiap kata, sedangkan vocabulary pesan customer
+    banyak yang berulang. Cache ini menyimpan hasil stem per token sehingga
+    kata yang sama tidak pernah di-stem dua kali.
+    """
+
+    def __init__(self, stemmer=None, maxsize=config.STEM_CACHE_SIZE):
+        self._stemmer = stemmer
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._new = None  # token baru sejak take_new(), None = tidak dicatat
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def stemmer(self):
+        """Stemmer Sastrawi (default get_stemmer(), dibuat saat cache miss pertama)"""
+        if self._stemmer is None:
+            self._stemmer = get_stemmer()
+        return self._stemmer
+
+    def stem_word(self, word):
+        """Stem satu token, ambil dari cache jika sudah pernah di-stem"""
+        try:
+            stem = self._data[word]
+        except KeyError:
+            self.misses += 1
+            stem = self.stemmer.stem(word)
+            self._data[word] = stem
+            if self._new is not None:
+                self._new.append((word, stem))
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return stem
+
+        self.hits += 1
+        self._data.move_to_end(word)
+        return stem
+
+    def stem(self, text):
+        """Stem kalimat per token (hasil sama dengan stemmer.stem)"""
+        words = TextNormalizer.normalize_text(text).split(' ')
+        return ' '.join(self.stem_word(word) for word in words)
+
+    def stats(self):
+        """
+        Statistik cache
+
+        Returns:
+            dict: size, maxsize, hits, misses, hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        """Kosongkan cache dan reset counter"""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def items(self):
+        """List pasangan (token, stem) dari yang paling lama dipakai"""
+        return list(self._data.items())
+
+    def record_new(self):
+        """Mulai mencatat token yang baru di-stem (lihat take_new)"""
+        self._new = []
+
+    def take_new(self):
+        """
+        Pasangan (token, stem) yang baru di-stem sejak pemanggilan sebelumnya
+
+        Returns:
+            list: Pasangan (token, stem), kosong jika pencatatan tidak aktif
+        """
+        if self._new is None:
+            return []
+        new, self._new = self._new, []
+        return new
+
+    def update(self, items):
+        """Tambahkan pasangan (token, stem) ke cache tanpa mengubah counter"""
+        for word, stem in items:
+            self._data[word] = stem
+            self._data.move_to_end(word)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def save(self, path):
+        """Simpan isi cache ke disk"""
+        with open(path, 'wb') as f:
+            pickle.dump(self.items(), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def load(self, path):
+        """
+        Load cache dari disk (jika file ada)
+
+        Returns:
+            int: Jumlah token yang di-load
+        """
+        if not os.path.exists(path):
+            return 0
+
+        with open(path, 'rb') as f:
+            self.update(pickle.load(f))
+        return len(self._data)
+
+
+stem_cache = StemCache()
+
+
+# Pattern noise (URL, email, mention, hashtag) di-compile sekali, masing-masing
+# dengan substring yang wajib ada agar regex bisa match (untuk skip regex).
+# Urutan sama dengan remove_noise versi awal agar hasilnya identik.
+NOISE_PATTERNS = [
+    (('http', 'www.'), re.compile(r'http\S+|www\.\S+')),
+    (('@',), re.compile(r'\S+@\S+')),
+    (('@',), re.compile(r'@\w+')),
+    (('#',), re.compile(r'#\w+'))
+]
+PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
 
 
 def remove_noise(text):
     """Menghapuse URL, emails, mentions, hashtag"""
-    text = re.sub(r'http\S+|www\.\S+', '', text)
-    text = re.sub(r'\S+@\S+', '', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'#\w+', '', text)
+    for _, pattern in NOISE_PATTERNS:
+        text = pattern.sub('', text)
     return text
 
 
 def remove_punctuation(text):
     """Menghapus Punctuation/Tanda Baca"""
-    text = text.translate(str.maketrans('','', string.punctuation))
+    text = text.translate(PUNCTUATION_TABLE)
     return text
 
 
 def remove_stopwords(text):
     """"Menghapus Stopwords Indonesia"""
-    text = stopword_remover.remove(text)
+    text = get_stopword_remover().remove(text)
     return text
 
 
 def stem_text(text):
-    """Stemming dengan Sastrawi"""
-    stemmed = stemmer.stem(text)
+    """Stemming dengan Sastrawi (melalui stem_cache)"""
+    stemmed = stem_cache.stem(text)
     return stemmed
 
 
+def _clean_one(text, patterns=NOISE_PATTERNS, table=PUNCTUATION_TABLE, observe=None):
+    """
+    Casefolding, hapus noise, dan hapus punctuation untuk satu teks
+
+    Args:
+        observe (callable): Opsional, observe(stage, detik) dipanggil dengan
+            durasi setiap tahap (dipakai instrumentasi metrics)
+    """
+    if observe is not None:
+        start = time.perf_counter()
+    text = str(text).lower()
+    if observe is not None:
+        start = _observe(observe, 'preprocess.casefold', start)
+    for needles, pattern in patterns:
+        if any(needle in text for needle in needles):
+            text = pattern.sub('', text)
+    if observe is not None:
+        start = _observe(observe, 'preprocess.noise', start)
+    text = text.translate(table)
+    if observe is not None:
+        _observe(observe, 'preprocess.punctuation', start)
+    return text
+
+
+def _observe(observe, stage, start):
+    """Catat durasi tahap sejak start, kembalikan waktu sekarang sebagai start tahap berikutnya"""
+    now = time.perf_counter()
+    observe(stage, now - start)
+    return now
+
+
+def _preprocess_one(text, observe=None):
+    """Seluruh pipeline preprocessing untuk satu teks (lihat preprocess_text)"""
+    text = _clean_one(text, observe=observe)
+    if observe is None:
+        return stem_text(remove_stopwords(text))
+    
+    start = time.perf_counter()
+    text = remove_stopwords(text)
+    start = _observe(observe, 'preprocess.stopwords', start)
+    text = stem_text(text)
+    _observe(observe, 'preprocess.stemming', start)
+    return text
+
+
+def clean_texts(texts):
+    """
+    Batch cleaning: casefolding, menghapus noise, dan menghapus punctuation
+
+    Semua pattern sudah di-compile dan translate table dibuat sekali,
+    sehingga setiap teks hanya melewati satu fungsi tanpa lookup ulang.
+    Regex noise dilewati jika teks tidak mengandung karakter pemicunya.
+
+    Args:
+        texts (list | pd.Series): Kumpulan teks
+
+    Returns:
+        list | pd.Series: Teks yang sudah dibersihkan (tipe sama dengan input)
+    """
+    # Input Series hanya mungkin jika pandas sudah di-import
+    pd = sys.modules.get('pandas')
+    if pd is not None and isinstance(texts, pd.Series):
+        return pd.Series(
+            [_clean_one(text) for text in texts],
+            index=texts.index,
+            name=texts.name,
+            dtype=object
+        )
+    return [_clean_one(text) for text in texts]
+
+
+def preprocess_texts(texts):
+    """
+    Preprocessing pipeline untuk kumpulan teks (lihat preprocess_text)
+
+    Args:
+        texts (list | pd.Series): Kumpulan teks
+
+    Returns:
+        list: Teks hasil preprocessing
+    """
+    observe = metrics.observe if metrics.enabled else None
+    return [_preprocess_one(text, observe) for text in texts]
+
+
 def preprocess_text(text):
     """
     Preprocessing pipeline:
@@ -52,40 +319,217 @@ def preprocess_text(text):
     4. Menghapus stopwords
     5. Stemming
     """
+    return _preprocess_one(text, metrics.observe if metrics.enabled else None)
+
+
+def _init_worker(cache_items):
+    """
+    Initializer untuk worker process preprocessing
+
+    Stemmer dan stopword remover Sastrawi dibuat sekali per worker saat
+    pertama dipakai, di sini hanya stem cache yang di-warm-up. Token yang
+    baru di-stem di worker dicatat agar hanya itu yang dikirim balik.
+    """
+    stem_cache.update(cache_items)
+    stem_cache.record_new()
+
+
+def _preprocess_chunk(texts):
+    """
+    Preprocess satu chunk teks di worker process
+
+    Returns:
+        tuple: list teks hasil preprocessing, pasangan (token, stem) yang baru
+            di-stem di chunk ini
+    """
+    processed = preprocess_texts(texts)
+    return processed, stem_cache.take_new()
+
+
+def create_preprocess_pool(workers):
+    """Buat process pool untuk preprocessing dengan stem cache yang sudah warm"""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(stem_cache.items(),)
+    )
+
+
+def preprocess_parallel(texts, workers, executor=None):
+    """
+    Preprocess teks secara paralel dengan process pool
+
+    Urutan output sama dengan input, hasil sama dengan preprocess_text.
+
+    Args:
+        texts (pd.Series): Teks yang akan di-preprocess
+        workers (int): Jumlah worker process
+        executor: Process pool yang sudah ada (opsional, untuk dipakai ulang)
+
+    Returns:
+        list: Teks hasil preprocessing
+    """
+    import numpy as np
     
-    # Lowercase/Casefolding
-    text = str(text).lower()
+    chunks = [
+        chunk for chunk in np.array_split(np.asarray(texts, dtype=object), workers * 4)
+        if len(chunk)
+    ]
     
-    # Menghapus Noise
-    text = remove_noise(text)
+    if executor is None:
+        with create_preprocess_pool(workers) as executor:
+            return preprocess_parallel(texts, workers, executor)
     
-    # Menghapus Punctuation
-    text = remove_punctuation(text)
+    processed = []
+    for chunk_result, cache_items in executor.map(_preprocess_chunk, chunks):
+        processed.extend(chunk_result)
+        stem_cache.update(cache_items)
     
-    # Menghapus Stopwords
-    text = remove_stopwords(text)
+    return processed
+
+
+class HashIndex:
+    """
+    Kumpulan hash baris (np.uint64) untuk deduplikasi antar chunk
+
+    Hash disimpan dalam beberapa array terurut dengan ukuran bertingkat: array
+    baru digabung dengan array terakhir selama array terakhir kurang dari dua
+    kali ukurannya. Jumlah array O(log n) dan setiap hash hanya ikut di-merge
+    O(log n) kali (tidak menyalin seluruh index di setiap chunk). Memory
+    8 byte per hash unik.
+    """
+
+    def __init__(self):
+        self._levels = []
+
+    def __len__(self):
+        return sum(len(level) for level in self._levels)
+
+    def contains(self, hashes):
+        """Mask boolean: hash yang sudah ada di index"""
+        import numpy as np
+
+        found = np.zeros(len(hashes), dtype=bool)
+        for level in self._levels:
+            pos = np.searchsorted(level, hashes).clip(max=len(level) - 1)
+            found |= level[pos] == hashes
+        return found
+
+    def add(self, hashes):
+        """Tambahkan hash (yang belum ada di index) ke index"""
+        import numpy as np
+
+        merged = np.unique(hashes)
+        while self._levels and len(self._levels[-1]) < 2 * len(merged):
+            merged = np.union1d(self._levels.pop(), merged)
+        if len(merged):
+            self._levels.append(merged)
+
+
+def clean_data_streaming(input_file, output_file, chunksize, workers=1):
+    """
+    Membersihkan dataset per chunk dengan memory yang tetap
+
+    Data duplikat dihapus antar chunk menggunakan hash 64-bit per baris
+    (HashIndex), hasil preprocessing langsung di-append ke output file.
+    Memory yang tetap berlaku untuk data per chunk; index hash tetap tumbuh
+    8 byte per baris unik.
+
+    Args:
+        input_file (str): Path ke data raw
+        output_file (str): Path untuk save clean data
+        chunksize (int): Jumlah baris per chunk
+        workers (int): Jumlah worker process untuk preprocessing teks
+
+    Returns:
+        dict: Jumlah baris input, duplikat, dan baris yang disimpan
+    """
+    import pandas as pd
     
-    # Stemming
-    text = stem_text(text) 
+    # Load stem cache dari run sebelumnya
+    if config.STEM_CACHE_PERSIST:
+        stem_cache.load(config.STEM_CACHE_FILE)
     
-    return text
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    
+    seen = HashIndex()
+    total_rows = 0
+    duplicates = 0
+    label_counts = pd.Series(dtype='int64')
+    executor = create_preprocess_pool(workers) if workers > 1 else None
+    
+    print(f"Streaming preprocessing (chunksize={chunksize}, workers={workers})...")
+    try:
+        for i, chunk in enumerate(pd.read_csv(input_file, chunksize=chunksize)):
+            if 'Unnamed: 0' in chunk.columns:
+                chunk = chunk.drop(columns='Unnamed: 0')
+            total_rows += len(chunk)
+            
+            # Menghapus data duplikat (termasuk duplikat dari chunk sebelumnya)
+            hashes = pd.util.hash_pandas_object(chunk.astype(object), index=False).to_numpy()
+            keep = ~pd.Series(hashes).duplicated().to_numpy()
+            keep &= ~seen.contains(hashes)
+            seen.add(hashes[keep])
+            chunk = chunk[keep].copy()
+            duplicates += len(keep) - len(chunk)
+            
+            if 'label' in chunk.columns:
+                label_counts = label_counts.add(chunk['label'].value_counts(), fill_value=0)
+            
+            # Preprocess data questions
+            if executor is not None:
+                chunk['question'] = preprocess_parallel(chunk['question'], workers, executor)
+            else:
+                chunk['question'] = preprocess_texts(chunk['question'])
+            
+            chunk.to_csv(output_file, mode='a', header=(i == 0), index=False)
+            print(f"Chunk {i + 1}: {total_rows} rows read, {total_rows - duplicates} rows saved")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    print(f"\nDuplicate data: {duplicates}")
+    print(f"\nLabel distribution:\n{label_counts.astype('int64')}")
+    print(f"Stem cache: {stem_cache.stats()}")
+    print(f"\nCleaned data saved to: {output_file}")
+    
+    if config.STEM_CACHE_PERSIST:
+        stem_cache.save(config.STEM_CACHE_FILE)
+    
+    return {
+        'rows': total_rows,
+        'duplicates': duplicates,
+        'saved': total_rows - duplicates
+    }
 
 
-def clean_data(input_file, output_file):
+def clean_data(input_file, output_file, workers=1, chunksize=None):
     """
     Membersihkan dataset dan save ke file csv
 
     Args:
         input_file (str): Path ke data raw
         output_file (str): Path untuk save clean data
+        workers (int): Jumlah worker process untuk preprocessing teks
+        chunksize (int): Jika diisi, data diproses secara streaming per chunk
+            (lihat clean_data_streaming)
 
     Returns:
-        pd.Dataframe: Cleaned dataframe
+        pd.Dataframe: Cleaned dataframe (dict ringkasan untuk mode streaming)
     """
+    import pandas as pd
+    
+    if chunksize:
+        return clean_data_streaming(input_file, output_file, chunksize, workers)
     
     # Read dataset
     df = pd.read_csv(input_file)
     
+    # Load stem cache dari run sebelumnya
+    if config.STEM_CACHE_PERSIST:
+        stem_cache.load(config.STEM_CACHE_FILE)
+    
     if 'Unnamed: 0' in df.columns:
         df = df.drop(columns='Unnamed: 0')
     
@@ -104,13 +548,22 @@ def clean_data(input_file, output_file):
     print(f"\nLabel distribution:\n{df['label'].value_counts()}")
     
     # Preprocess data questions
-    print("\nPreprocessing text...")
-    df['question'] = df['question'].apply(preprocess_text)
+    if workers > 1:
+        print(f"\nPreprocessing text ({workers} workers)...")
+        df['question'] = preprocess_parallel(df['question'], workers)
+    else:
+        print("\nPreprocessing text...")
+        df['question'] = preprocess_texts(df['question'])
+    print(f"Stem cache: {stem_cache.stats()}")
     
     # Save cleaned data
     df.to_csv(output_file, index=False)
     print(f"\nCleaned data saved to: {output_file}")
     
+    # Save stem cache agar bisa dipakai ulang
+    if config.STEM_CACHE_PERSIST:
+        stem_cache.save(config.STEM_CACHE_FILE)
+    
     return df
 
 
@@ -0,0 +1,153 @@
+"""
+Modul untuk versioned model registry
+
+Setiap save_models menulis satu direktori versi yang immutable di
+config.MODEL_VERSIONS_DIR, lalu pointer config.MODEL_CURRENT_FILE diganti
+secara atomic (os.replace). Consumer yang berjalan lama (MessageClassifier)
+cukup membaca pointer untuk mendeteksi versi baru.
+
+Layout:
+    models/CURRENT                      id versi aktif
+    models/versions/<id>/               svm_model.pkl, tfidf_vectorizer.pkl,
+                                        label_encoder.pkl, linear_weights.npz,
+                                        classifier.bundle, model_version.txt
+
+Jika belum ada pointer (model lama), artifact dibaca dari path flat di config.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import config
+
+# Path artifact flat (sebelum registry), dipakai sebagai fallback
+LEGACY_PATHS = {
+    'model': config.SVM_MODEL_FILE,
+    'vectorizer': config.VECTORIZER_FILE,
+    'label_encoder': config.LABEL_ENCODER_FILE,
+    'linear_weights': config.LINEAR_WEIGHTS_FILE,
+    'bundle': config.MODEL_BUNDLE_FILE,
+    'version': config.MODEL_VERSION_FILE
+}
+
+
+def current_version():
+    """
+    Id versi aktif dari pointer CURRENT
+
+    Returns:
+        str: Id versi, atau None jika registry belum dipakai
+    """
+    try:
+        with open(config.MODEL_CURRENT_FILE) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def version_dir(version):
+    """Direktori artifact untuk satu versi"""
+    return os.path.join(config.MODEL_VERSIONS_DIR, version)
+
+
+def artifact_paths(version=None):
+    """
+    Path artifact model untuk satu versi
+
+    Args:
+        version (str): Id versi (default: versi aktif)
+
+    Returns:
+        dict: name -> path ('model', 'vectorizer', 'label_encoder',
+            'linear_weights', 'bundle', 'version')
+    """
+    version = version or current_version()
+    if version is None:
+        return dict(LEGACY_PATHS)
+    return _paths_in(version_dir(version))
+
+
+def _paths_in(directory):
+    return {
+        name: os.path.join(directory, os.path.basename(path))
+        for name, path in LEGACY_PATHS.items()
+    }
+
+
+def list_versions():
+    """Id semua versi yang tersimpan, urut dari yang terlama"""
+    if not os.path.isdir(config.MODEL_VERSIONS_DIR):
+        return []
+    return sorted(
+        name for name in os.listdir(config.MODEL_VERSIONS_DIR)
+        if not name.startswith('.') and os.path.isdir(version_dir(name))
+    )
+
+
+def stage_version():
+    """
+    Buat direktori staging untuk versi baru
+
+    Returns:
+        tuple: staging dir, dict path artifact di dalamnya
+    """
+    os.makedirs(config.MODEL_VERSIONS_DIR, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=config.MODEL_VERSIONS_DIR, prefix='.staging-')
+    return staging, _paths_in(staging)
+
+
+def commit_version(staging, fingerprint):
+    """
+    Jadikan direktori staging versi immutable lalu aktifkan
+
+    Args:
+        staging (str): Direktori staging dari stage_version
+        fingerprint (str): Fingerprint artifact (bagian dari id versi)
+
+    Returns:
+        str: Id versi baru
+    """
+    version = f"{time.strftime('%Y%m%d-%H%M%S')}-{fingerprint[:8]}"
+    target = version_dir(version)
+    if os.path.exists(target):
+        # Artifact identik di detik yang sama, pakai versi yang sudah ada
+        shutil.rmtree(staging, ignore_errors=True)
+    else:
+        os.rename(staging, target)
+
+    publish(version)
+    prune()
+    return version
+
+
+def publish(version):
+    """
+    Ganti pointer CURRENT secara atomic (juga untuk rollback ke versi lama)
+
+    Raises:
+        FileNotFoundError: Jika versi tidak ada
+    """
+    if not os.path.isdir(version_dir(version)):
+        raise FileNotFoundError(f"Versi model tidak ditemukan: {version}")
+
+    fd, tmp = tempfile.mkstemp(dir=config.MODELS_DIR, prefix='.CURRENT-')
+    with os.fdopen(fd, 'w') as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, config.MODEL_CURRENT_FILE)
+
+
+def prune(keep=config.MODEL_REGISTRY_KEEP):
+    """
+    Hapus versi terlama, simpan `keep` versi terbaru dan versi aktif
+
+    File yang masih di-memory-map oleh process lain tetap valid setelah dihapus.
+    """
+    current = current_version()
+    versions = list_versions()
+    for version in versions[:max(len(versions) - keep, 0)]:
+        if version != current:
+            shutil.rmtree(version_dir(version), ignore_errors=True)
@@ -0,0 +1,289 @@
+"""
+Modul untuk classification server (model tetap warm di memory)
+
+Request yang datang bersamaan dikumpulkan menjadi micro-batch, sehingga
+vectorize dan predict hanya dijalankan sekali per batch.
+
+Versi model baru di registry di-load di background dan di-swap tanpa
+restart (config.SERVE_AUTO_RELOAD).
+
+Endpoint:
+    POST /predict   body: {"text": "..."} atau {"texts": ["...", "..."]}
+    GET  /health
+    GET  /metrics   format teks Prometheus (histogram per tahap jika
+                    instrumentasi aktif, counter batching dan cache)
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import metrics
+from .prediction import MessageClassifier
+import config
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+
+class MicroBatcher:
+    """Mengumpulkan request menjadi micro-batch dengan batas ukuran dan waktu"""
+
+    def __init__(self, classifier, max_batch_size=config.SERVE_MAX_BATCH_SIZE,
+                 max_wait_ms=config.SERVE_MAX_WAIT_MS):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.requests = 0
+        # Satu thread agar classifier tidak dipakai bersamaan
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+
+    async def submit(self, text):
+        """
+        Masukkan satu teks ke antrian dan tunggu hasilnya
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            dict: {'text', 'prediction', 'scores'}
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((text, future))
+        return await future
+
+
+    async def _collect_batch(self):
+        """Ambil item pertama, lalu kumpulkan item lain sampai batch penuh atau waktu habis"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+
+    async def run(self):
+        """Loop utama: collect batch, predict sekali, kirim hasil ke setiap request"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch()
+            texts = [text for text, _ in batch]
+            try:
+                with metrics.timer('serve.batch'):
+                    results = await loop.run_in_executor(
+                        self._executor, self.classifier.predict_many, texts, True
+                    )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(_to_json_result(result))
+
+
+    def stats(self):
+        """Statistik batching"""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'avg_batch_size': self.requests / self.batches if self.batches else 0.0,
+            'queue_size': self.queue.qsize()
+        }
+
+
+def _to_json_result(result):
+    """Konversi hasil prediksi (numpy types) ke tipe JSON"""
+    scores = result['scores']
+    return {
+        'text': result['text'],
+        'prediction': str(result['prediction']),
+        'scores': {str(k): float(v) for k, v in scores.items()} if scores else None
+    }
+
+
+async def _read_request(reader):
+    """Parse HTTP request sederhana: method, path, body"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode('latin-1').split(' ', 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get('content-length', 0))
+    body = await reader.readexactly(length) if length else b''
+    return method, path, headers, body
+
+
+def _write_response(writer, status, payload, content_type='application/json',
+                    keep_alive=True):
+    """Tulis HTTP response"""
+    reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 500: 'Internal Server Error'}
+    if content_type == 'application/json':
+        body = json.dumps(payload).encode('utf-8')
+    else:
+        body = payload.encode('utf-8')
+
+    writer.write(
+        f"HTTP/1.1 {status} {reasons.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1')
+        + body
+    )
+
+
+class ClassificationServer:
+    """HTTP server (TCP atau Unix socket) di depan MicroBatcher"""
+
+    def __init__(self, classifier, max_batch_size=config.SERVE_MAX_BATCH_SIZE,
+                 max_wait_ms=config.SERVE_MAX_WAIT_MS):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batcher = None
+
+
+    async def handle_predict(self, body):
+        """Handle POST /predict"""
+        data = json.loads(body or b'{}')
+        if not isinstance(data, dict):
+            raise ValueError("Body harus berupa JSON object")
+        if 'texts' in data:
+            texts = data['texts']
+            if not isinstance(texts, list):
+                raise ValueError("'texts' harus berupa list")
+            results = await asyncio.gather(*(self.batcher.submit(str(t)) for t in texts))
+            return {'results': list(results)}
+        if 'text' in data:
+            return await self.batcher.submit(str(data['text']))
+        raise ValueError("Body harus berisi 'text' atau 'texts'")
+
+
+    def prometheus_metrics(self):
+        """Metrics server dalam format teks Prometheus"""
+        batching = self.batcher.stats()
+        extra = [
+            ('requests_total', 'counter', 'Jumlah teks yang diprediksi', batching['requests']),
+            ('batches_total', 'counter', 'Jumlah micro-batch', batching['batches']),
+            ('queue_size', 'gauge', 'Teks yang menunggu di antrian', batching['queue_size'])
+        ]
+        cache = self.classifier.cache_stats()
+        if cache:
+            extra += [
+                ('cache_hits_total', 'counter', 'Cache prediksi hit', cache['hits']),
+                ('cache_misses_total', 'counter', 'Cache prediksi miss', cache['misses']),
+                ('cache_size', 'gauge', 'Jumlah entry cache prediksi', cache['size'])
+            ]
+        return metrics.to_prometheus(extra)
+    
+    
+    async def handle_connection(self, reader, writer):
+        """Handle satu koneksi client (mendukung keep-alive)"""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                content_type = 'application/json'
+
+                try:
+                    if method == 'POST' and path == '/predict':
+                        with metrics.timer('serve.request'):
+                            status, payload = 200, await self.handle_predict(body)
+                    elif method == 'GET' and path == '/health':
+                        status, payload = 200, {
+                            'status': 'ok',
+                            'model_version': self.classifier.model_version,
+                            **self.batcher.stats(),
+                            'cache': self.classifier.cache_stats()
+                        }
+                    elif method == 'GET' and path == '/metrics':
+                        status, payload = 200, self.prometheus_metrics()
+                        content_type = PROMETHEUS_CONTENT_TYPE
+                    else:
+                        status, payload = 404, {'error': f"Unknown endpoint: {method} {path}"}
+                except (ValueError, json.JSONDecodeError) as e:
+                    status, payload = 400, {'error': str(e)}
+                    content_type = 'application/json'
+                except Exception as e:
+                    status, payload = 500, {'error': str(e)}
+                    content_type = 'application/json'
+
+                _write_response(writer, status, payload, content_type, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+    async def serve(self, host=config.SERVE_HOST, port=config.SERVE_PORT, socket_path=None):
+        """Jalankan server sampai dihentikan"""
+        self.batcher = MicroBatcher(self.classifier, self.max_batch_size, self.max_wait_ms)
+        batch_task = asyncio.create_task(self.batcher.run())
+
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+            print(f"Serving on unix socket {socket_path}")
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+            print(f"Serving on http://{host}:{port}")
+        print(f"Micro-batch: max size {self.max_batch_size}, max wait {self.max_wait_ms} ms")
+
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batch_task.cancel()
+
+
+def serve(host=config.SERVE_HOST, port=config.SERVE_PORT, socket_path=None,
+          max_batch_size=config.SERVE_MAX_BATCH_SIZE, max_wait_ms=config.SERVE_MAX_WAIT_MS):
+    """
+    Jalankan classification server dengan MessageClassifier yang warm
+
+    Args:
+        host (str): Host TCP
+        port (int): Port TCP
+        socket_path (str): Path Unix socket (jika diisi, host/port diabaikan)
+        max_batch_size (int): Ukuran maksimal micro-batch
+        max_wait_ms (float): Waktu tunggu maksimal untuk mengisi micro-batch
+    """
+    # Model baru dari registry di-swap otomatis tanpa restart server
+    classifier = MessageClassifier(auto_reload=config.SERVE_AUTO_RELOAD)
+    server = ClassificationServer(classifier, max_batch_size, max_wait_ms)
+
+    try:
+        asyncio.run(server.serve(host, port, socket_path))
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+    finally:
+        classifier.stop_watching()
+        classifier.save_cache()
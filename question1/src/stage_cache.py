@@ -0,0 +1,232 @@
+"""
+Modul untuk cache tahap pipeline training (split, vectorizer, feature matrix)
+
+Setiap tahap di-key dengan hash isi input dan parameter config yang dipakai
+tahap tersebut, sehingga train, evaluate, dan tune hanya menghitung ulang
+tahap yang input atau config-nya berubah.
+
+Layout di config.STAGE_CACHE_DIR:
+    split-<key>.joblib            X_train, X_test, y_train, y_test
+    features-<key>/               vectorizer.joblib, X_train.npz, X_test.npz
+    eval-<key>.npz                X_test hasil transform vectorizer tersimpan
+    tune/                         cache vectorizer per fold (joblib Memory)
+
+Entry yang dibaca di-touch (mtime diperbarui), sehingga pruning per tahap
+membuang entry yang paling lama tidak dipakai (LRU).
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import joblib
+import scipy.sparse as sp
+
+import config
+
+
+def file_digest(path):
+    """SHA-256 isi file (hex)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def split_params():
+    """Parameter config yang mempengaruhi train/test split"""
+    return {'test_size': config.TEST_SIZE, 'random_state': config.RANDOM_STATE}
+
+
+def feature_params(backend=None):
+    """Parameter config yang mempengaruhi vectorizer dan feature matrix"""
+    backend = backend or config.FEATURE_BACKEND
+    if backend == 'hashing':
+        return {
+            'backend': backend,
+            'n_features': config.HASHING_N_FEATURES,
+            'ngram_range': list(config.TFIDF_NGRAM_RANGE),
+            'use_idf': config.HASHING_USE_IDF
+        }
+    return {
+        'backend': backend,
+        'max_features': config.TFIDF_MAX_FEATURES,
+        'ngram_range': list(config.TFIDF_NGRAM_RANGE)
+    }
+
+
+class StageCache:
+    """
+    Cache hasil tahap pipeline di disk, di-key dengan content hash
+
+    Jika dinonaktifkan, setiap tahap selalu dihitung (compute) tanpa disimpan.
+    """
+
+    def __init__(self, cache_dir=None, enabled=None, max_entries=None):
+        # Default dibaca dari config saat dibuat (bukan saat modul di-import)
+        self.cache_dir = cache_dir or config.STAGE_CACHE_DIR
+        self.enabled = config.STAGE_CACHE_ENABLED if enabled is None else enabled
+        self.max_entries = max_entries or config.STAGE_CACHE_MAX_ENTRIES
+        self.events = []
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(*parts):
+        """Key tahap dari gabungan input (digest upstream, parameter)"""
+        payload = json.dumps(parts, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()[:16]
+
+    def _path(self, stage, key, suffix=''):
+        return os.path.join(self.cache_dir, f"{stage}-{key}{suffix}")
+
+    def _record(self, stage, hit):
+        self.events.append((stage, hit))
+
+    @staticmethod
+    def _touch(path):
+        """Tandai entry baru dipakai (mtime jadi urutan LRU untuk _prune)"""
+        try:
+            os.utime(path)
+        except OSError:
+            # Entry bisa saja baru di-prune oleh process lain
+            pass
+
+    def _prune(self, stage):
+        """Simpan hanya max_entries entry yang terakhir dipakai per tahap"""
+        entries = sorted(glob.glob(self._path(stage, '*')), key=os.path.getmtime, reverse=True)
+        for path in entries[self.max_entries:]:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+
+    def _atomic_dump(self, obj, path):
+        """joblib.dump ke file sementara lalu os.replace"""
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        joblib.dump(obj, tmp)
+        os.replace(tmp, path)
+
+    def split(self, data_file, compute):
+        """
+        Train/test split dari data file
+
+        Args:
+            data_file (str): Path ke cleaned data file
+            compute (callable): compute(data_file) -> X_train, X_test, y_train, y_test
+
+        Returns:
+            tuple: key, (X_train, X_test, y_train, y_test)
+        """
+        key = self.key('split', file_digest(data_file), split_params())
+        path = self._path('split', key, '.joblib')
+
+        if self.enabled and os.path.exists(path):
+            splits = joblib.load(path)
+            self._touch(path)
+            self._record('split', True)
+            print(f"Training data: {len(splits[0])}")
+            print(f"Test data: {len(splits[1])}")
+            return key, splits
+
+        splits = compute(data_file)
+        self._record('split', False)
+        if self.enabled:
+            self._atomic_dump(tuple(splits), path)
+            self._prune('split')
+        return key, tuple(splits)
+
+    def features(self, split_key, splits, compute, backend=None):
+        """
+        Vectorizer yang sudah di-fit dan feature matrix train/test
+
+        Args:
+            split_key (str): Key tahap split
+            splits (tuple): X_train, X_test, y_train, y_test
+            compute (callable): compute(X_train, X_test, backend) -> vectorizer, X_train, X_test
+            backend (str): Feature backend (default: config.FEATURE_BACKEND)
+
+        Returns:
+            tuple: vectorizer, X_train matrix, X_test matrix
+        """
+        key = self.key('features', split_key, feature_params(backend))
+        path = self._path('features', key)
+
+        if self.enabled and os.path.isdir(path):
+            vectorizer = joblib.load(os.path.join(path, 'vectorizer.joblib'))
+            X_train = sp.load_npz(os.path.join(path, 'X_train.npz'))
+            X_test = sp.load_npz(os.path.join(path, 'X_test.npz'))
+            self._touch(path)
+            self._record('features', True)
+            print(f"{type(vectorizer).__name__} features shape: {X_train.shape}")
+            return vectorizer, X_train, X_test
+
+        vectorizer, X_train, X_test = compute(splits[0], splits[1], backend)
+        self._record('features', False)
+        if self.enabled:
+            tmp = tempfile.mkdtemp(dir=self.cache_dir, suffix='.tmp')
+            joblib.dump(vectorizer, os.path.join(tmp, 'vectorizer.joblib'))
+            sp.save_npz(os.path.join(tmp, 'X_train.npz'), sp.csr_matrix(X_train))
+            sp.save_npz(os.path.join(tmp, 'X_test.npz'), sp.csr_matrix(X_test))
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+            self._prune('features')
+        return vectorizer, X_train, X_test
+
+    def transformed(self, split_key, vectorizer_file, texts, vectorizer):
+        """
+        Feature matrix dari vectorizer tersimpan (untuk evaluate)
+
+        Args:
+            split_key (str): Key tahap split
+            vectorizer_file (str): Path file vectorizer (isi file jadi bagian key)
+            texts: Teks yang di-transform
+            vectorizer: Vectorizer yang sudah di-load
+
+        Returns:
+            scipy.sparse.csr_matrix: Feature matrix
+        """
+        key = self.key('eval', split_key, file_digest(vectorizer_file))
+        path = self._path('eval', key, '.npz')
+
+        if self.enabled and os.path.exists(path):
+            X = sp.load_npz(path)
+            self._touch(path)
+            self._record('eval', True)
+            return X
+
+        X = sp.csr_matrix(vectorizer.transform(texts))
+        self._record('eval', False)
+        if self.enabled:
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.npz')
+            os.close(fd)
+            sp.save_npz(tmp, X)
+            os.replace(tmp, path)
+            self._prune('eval')
+        return X
+
+    def memory_dir(self, name):
+        """Direktori cache joblib Memory (None jika cache dinonaktifkan)"""
+        if not self.enabled:
+            return None
+        path = os.path.join(self.cache_dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def clear(self):
+        """Hapus semua isi cache"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def summary(self):
+        """Ringkasan hit/miss per tahap untuk log"""
+        if not self.events:
+            return 'tidak dipakai'
+        return ', '.join(f"{stage} {'hit' if hit else 'miss'}" for stage, hit in self.events)
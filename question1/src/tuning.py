@@ -0,0 +1,157 @@
+"""
+Modul untuk hyperparameter search (TF-IDF + SVM) dengan stratified k-fold CV
+
+Split data diambil dari stage cache, lalu semua kombinasi parameter
+dievaluasi paralel (joblib n_jobs). Vectorizer yang sudah di-fit di-cache per
+fold (Pipeline memory di stage cache), sehingga kombinasi dengan parameter
+vectorizer yang sama hanya mengganti parameter SVM tanpa fit TF-IDF ulang,
+juga antar run tune.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+from joblib import Memory
+from sklearn.metrics import f1_score, accuracy_score
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV, StratifiedKFold
+from sklearn.pipeline import Pipeline
+from sklearn.utils.class_weight import compute_sample_weight
+
+from .modeling import prepare_data, build_vectorizer, build_model
+from .stage_cache import StageCache
+import config
+
+
+def build_search(search=None, n_iter=None, folds=None, cache_dir=None):
+    """
+    Buat GridSearchCV / RandomizedSearchCV untuk pipeline vectorizer + SVM
+
+    Args:
+        search (str): 'grid' atau 'random' (default: config.TUNE_SEARCH)
+        n_iter (int): Jumlah kombinasi untuk random search (default: config.TUNE_N_ITER)
+        folds (int): Jumlah fold stratified CV (default: config.TUNE_CV_FOLDS)
+        cache_dir (str): Direktori cache vectorizer per fold (None = tanpa cache)
+
+    Returns:
+        GridSearchCV atau RandomizedSearchCV
+    """
+    search = search or config.TUNE_SEARCH
+    pipeline = Pipeline(
+        [('vectorizer', build_vectorizer('tfidf')), ('svm', build_model('svc'))],
+        memory=Memory(cache_dir, verbose=0) if cache_dir else None
+    )
+    cv = StratifiedKFold(
+        n_splits=folds or config.TUNE_CV_FOLDS,
+        shuffle=True,
+        random_state=config.RANDOM_STATE
+    )
+    common = {
+        'scoring': config.TUNE_SCORING,
+        'cv': cv,
+        'n_jobs': config.TUNE_N_JOBS,
+        'refit': True,
+        'return_train_score': False
+    }
+
+    if search == 'grid':
+        return GridSearchCV(pipeline, config.TUNE_PARAM_GRID, **common)
+    if search == 'random':
+        return RandomizedSearchCV(
+            pipeline,
+            config.TUNE_PARAM_GRID,
+            n_iter=n_iter or config.TUNE_N_ITER,
+            random_state=config.RANDOM_STATE,
+            **common
+        )
+
+    raise ValueError(f"Unknown search: {search}. Pilih: grid, random")
+
+
+def results_table(search):
+    """
+    Tabel hasil search, diurutkan berdasarkan ranking
+
+    Returns:
+        pd.DataFrame: rank, score, parameter, dan timing fit/predict per konfigurasi
+    """
+    cv_results = search.cv_results_
+    table = pd.DataFrame({
+        'rank': cv_results['rank_test_score'],
+        'mean_score': cv_results['mean_test_score'],
+        'std_score': cv_results['std_test_score']
+    })
+    for key in cv_results:
+        if key.startswith('param_'):
+            table[key[len('param_'):]] = [str(v) for v in cv_results[key]]
+    table['mean_fit_time'] = cv_results['mean_fit_time']
+    table['mean_predict_time'] = cv_results['mean_score_time']
+
+    return table.sort_values(['rank', 'mean_fit_time']).reset_index(drop=True)
+
+
+def tune_pipeline(data_file, search=None, n_iter=None, folds=None, output_file=None):
+    """
+    Hyperparameter search pada data train, evaluasi konfigurasi terbaik pada data test
+
+    Args:
+        data_file (str): Path ke cleaned data file
+        search (str): 'grid' atau 'random'
+        n_iter (int): Jumlah kombinasi untuk random search
+        folds (int): Jumlah fold CV
+        output_file (str): Path CSV hasil (default: config.TUNE_RESULTS_FILE)
+
+    Returns:
+        tuple: results table, best params, metrics (skor CV dan test)
+    """
+    print("Starting hyperparameter search...\n")
+
+    # Data sudah di-preprocess, split diambil dari stage cache untuk semua fold
+    cache = StageCache()
+    _, (X_train, X_test, y_train, y_test) = cache.split(data_file, prepare_data)
+
+    # Cache vectorizer per fold: persisten di stage cache, atau sementara
+    cache_dir = cache.memory_dir('tune')
+    temporary = cache_dir is None
+    if temporary:
+        cache_dir = tempfile.mkdtemp(prefix='tune_cache_')
+    try:
+        searcher = build_search(search, n_iter, folds, cache_dir)
+        sample_weights = compute_sample_weight(class_weight='balanced', y=y_train)
+
+        print(f"Search: {type(searcher).__name__}, {searcher.cv.n_splits}-fold, "
+              f"scoring {searcher.scoring}, n_jobs {searcher.n_jobs}")
+
+        start = time.perf_counter()
+        searcher.fit(X_train, y_train, svm__sample_weight=sample_weights)
+        search_time = time.perf_counter() - start
+    finally:
+        if temporary:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        else:
+            Memory(cache_dir, verbose=0).reduce_size(bytes_limit=config.STAGE_CACHE_TUNE_BYTES)
+    print(f"Stage cache: {cache.summary()}")
+
+    table = results_table(searcher)
+    output_file = output_file or config.TUNE_RESULTS_FILE
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    table.to_csv(output_file, index=False)
+
+    # Evaluasi model terbaik (refit pada seluruh data train) di data test
+    y_pred = searcher.predict(X_test)
+    metrics = {
+        'candidates': len(table),
+        'search_time': search_time,
+        'cv_score': searcher.best_score_,
+        'test_accuracy': accuracy_score(y_test, y_pred),
+        'test_f1_score': f1_score(y_test, y_pred, average='weighted'),
+        'output_file': output_file
+    }
+
+    print(f"\nTop 5 ({len(table)} konfigurasi, {search_time:.1f}s):")
+    print(table.head(5).to_string(index=False))
+    print(f"\nResults saved to: {output_file}")
+
+    return table, searcher.best_params_, metrics
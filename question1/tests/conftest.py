@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Agar `import config` dan `import src` bisa dipakai dari direktori tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
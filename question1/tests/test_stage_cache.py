@@ -0,0 +1,33 @@
+"""
+Test stage cache: pruning membuang entry yang paling lama tidak dipakai (LRU)
+"""
+
+import os
+
+from src.stage_cache import StageCache
+
+
+def _write(tmp_path, name, rows):
+    path = tmp_path / name
+    path.write_text('\n'.join(rows))
+    return str(path)
+
+
+def test_prune_keeps_recently_read_entry(tmp_path):
+    cache = StageCache(cache_dir=str(tmp_path / 'stages'), enabled=True, max_entries=2)
+    compute = lambda data_file: ([data_file], [], [], [])
+
+    files = [_write(tmp_path, f"data{i}.csv", [str(i)]) for i in range(3)]
+    key_a, _ = cache.split(files[0], compute)
+    key_b, _ = cache.split(files[1], compute)
+    # Entry a lebih lama dibuat, b lebih baru
+    os.utime(cache._path('split', key_a, '.joblib'), (1000, 1000))
+    os.utime(cache._path('split', key_b, '.joblib'), (2000, 2000))
+
+    # Hit pada a membuatnya jadi yang terakhir dipakai
+    cache.split(files[0], compute)
+    cache.split(files[2], compute)
+
+    assert cache.events == [('split', False), ('split', False), ('split', True), ('split', False)]
+    assert os.path.exists(cache._path('split', key_a, '.joblib'))
+    assert not os.path.exists(cache._path('split', key_b, '.joblib'))
@@ -0,0 +1,103 @@
+"""
+Test incremental update (--mode update): model bootstrap tidak boleh melihat data test
+"""
+
+import joblib
+import pytest
+from sklearn.metrics import accuracy_score
+from sklearn.svm import LinearSVC
+from sklearn.preprocessing import LabelEncoder
+
+import config
+from src import registry
+from src.modeling import (
+    prepare_data, build_hashing_vectorizer, build_incremental_model, build_model,
+    build_vectorizer, hash_texts, save_models, update_pipeline
+)
+
+
+@pytest.fixture
+def isolated_registry(tmp_path, monkeypatch):
+    """Registry model kosong di direktori sementara"""
+    models_dir = tmp_path / 'models'
+    models_dir.mkdir()
+    monkeypatch.setattr(config, 'MODELS_DIR', str(models_dir))
+    monkeypatch.setattr(config, 'MODEL_VERSIONS_DIR', str(models_dir / 'versions'))
+    monkeypatch.setattr(config, 'MODEL_CURRENT_FILE', str(models_dir / 'CURRENT'))
+    monkeypatch.setattr(config, 'STAGE_CACHE_DIR', str(models_dir / 'stages'))
+    monkeypatch.setattr(registry, 'LEGACY_PATHS', {
+        name: str(models_dir / 'legacy' / name) for name in registry.LEGACY_PATHS
+    })
+    return tmp_path
+
+
+@pytest.fixture
+def splits():
+    return prepare_data(config.PROCESSED_DATA)
+
+
+@pytest.fixture
+def new_data_file(isolated_registry, splits):
+    """Data berlabel baru dari data train (tidak ada baris data test)"""
+    X_train, _, y_train, _ = splits
+    path = isolated_registry / 'new_labeled.csv'
+    X_train.to_frame('question').assign(label=y_train).head(40).to_csv(path, index=False)
+    return str(path)
+
+
+def evaluate_accuracy(splits):
+    """Akurasi model aktif pada data test, seperti --mode evaluate"""
+    _, X_test, _, y_test = splits
+    paths = registry.artifact_paths()
+    model = joblib.load(paths['model'])
+    vectorizer = joblib.load(paths['vectorizer'])
+    return accuracy_score(y_test, model.predict(vectorizer.transform(X_test)))
+
+
+def test_update_accuracy_does_not_jump(new_data_file, splits):
+    X_train, X_test, y_train, y_test = splits
+
+    # Baseline: model incremental yang hanya dilatih dengan data train
+    vectorizer = build_hashing_vectorizer()
+    baseline = build_incremental_model().fit(hash_texts(vectorizer, X_train), y_train)
+    baseline_accuracy = accuracy_score(y_test, baseline.predict(hash_texts(vectorizer, X_test)))
+
+    _, _, _, metrics = update_pipeline(new_data_file)
+    assert metrics['bootstrapped']
+
+    accuracy = evaluate_accuracy(splits)
+    assert accuracy <= baseline_accuracy + 0.05
+
+
+def test_update_keeps_non_incremental_model(new_data_file, splits):
+    X_train, _, y_train, _ = splits
+    vectorizer = build_vectorizer('tfidf')
+    model = LinearSVC(dual='auto').fit(vectorizer.fit_transform(X_train), y_train)
+    version = save_models(model, vectorizer, LabelEncoder().fit(y_train))
+
+    with pytest.raises(ValueError, match='--bootstrap'):
+        update_pipeline(new_data_file)
+    assert registry.current_version() == version
+
+    update_pipeline(new_data_file, bootstrap=True)
+    assert registry.current_version() != version
+
+
+def test_update_sgd_hashing_model(isolated_registry, splits, monkeypatch):
+    """Model dari --backend sgd --features hashing (tanpa IDF) bisa di-update langsung"""
+    monkeypatch.setattr(config, 'HASHING_USE_IDF', False)
+    X_train, _, y_train, _ = splits
+    vectorizer = build_vectorizer('hashing')
+    model = build_model('sgd').fit(hash_texts(vectorizer, X_train), y_train)
+    assert model.class_weight == 'balanced'
+    version = save_models(model, vectorizer, LabelEncoder().fit(y_train))
+
+    # Batch dengan satu kelas saja
+    label = y_train.iloc[0]
+    path = isolated_registry / 'one_label.csv'
+    X_train[y_train == label].to_frame('question').assign(label=label).head(20).to_csv(path, index=False)
+
+    updated, _, _, metrics = update_pipeline(str(path))
+    assert not metrics['bootstrapped']
+    assert updated.class_weight is None
+    assert registry.current_version() != version
@@ -1,6 +1,48 @@
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+import httpx
+import requests
 import streamlit as st
 import ollama
 from datetime import datetime
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from scheduler import RequestScheduler, QueueFull, Cancelled
+
+MODEL = "gemma3:1b"
+# Options generate untuk ollama.chat (mis. {"temperature": 0.7}), juga bagian dari key cache
+OLLAMA_OPTIONS = {}
+# Tampilkan response token per token (stream=True di ollama.chat)
+STREAM_RESPONSES = True
+# Interval refresh status Ollama dan daftar model di background (detik)
+HEALTH_REFRESH_INTERVAL = 10
+# Budget token untuk history percakapan yang dikirim ke model (sisa context
+# window dipakai untuk response)
+CONTEXT_TOKEN_BUDGET = 1536
+# Ringkas turn lama yang tidak muat di budget (satu request tambahan ke model);
+# jika False, turn lama di-drop
+CONTEXT_SUMMARIZE = False
+# Estimasi kasar jumlah karakter per token
+CHARS_PER_TOKEN = 4
+# Cache response (dipakai bersama semua session, disimpan di disk)
+RESPONSE_CACHE_ENABLED = True
+RESPONSE_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "responses.json")
+RESPONSE_CACHE_MAX_ENTRIES = 500
+# Lookup berdasarkan kemiripan TF-IDF (cosine) jika tidak ada exact match;
+# None = hanya exact match
+RESPONSE_CACHE_SIMILARITY = None
+# Scheduler request ke Ollama untuk semua session: jumlah request bersamaan
+# disamakan dengan OLLAMA_NUM_PARALLEL di server
+SCHEDULER_MAX_CONCURRENCY = int(os.environ.get("OLLAMA_NUM_PARALLEL", 1))
+SCHEDULER_MAX_QUEUE = 32
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -12,47 +54,468 @@ st.set_page_config(
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
+# Status Ollama yang dipakai bersama semua session
+class OllamaMonitor:
+    """
+    Status koneksi Ollama dan inventory model (ollama.list dan ollama.ps)
+
+    Di-refresh oleh satu background thread setiap HEALTH_REFRESH_INTERVAL
+    detik, sehingga rerun Streamlit cukup membaca snapshot terakhir tanpa
+    request ke server Ollama.
+    """
+
+    def __init__(self, interval=HEALTH_REFRESH_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._status = self._probe()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _probe(self):
+        """Request ke Ollama: daftar model tersedia dan model yang sedang di-load"""
+        try:
+            available = [m.get("name") or m.get("model") for m in ollama.list()["models"]]
+            loaded = [m.get("name") or m.get("model") for m in ollama.ps()["models"]]
+            return {
+                "connected": True,
+                "message": "Ollama service running",
+                "models": sorted(available),
+                "loaded": sorted(loaded),
+                "checked_at": datetime.now().strftime("%H:%M:%S")
+            }
+        except Exception as e:
+            return {
+                "connected": False,
+                "message": f"Ollama service error: {str(e)}",
+                "models": [],
+                "loaded": [],
+                "checked_at": datetime.now().strftime("%H:%M:%S")
+            }
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            self.refresh()
+
+    def status(self):
+        """
+        Snapshot status terakhir
+
+        Returns:
+            dict: connected, message, models, loaded, checked_at
+        """
+        with self._lock:
+            return dict(self._status)
+
+    def refresh(self):
+        """Cek ulang status Ollama sekarang dan simpan hasilnya"""
+        status = self._probe()
+        with self._lock:
+            self._status = status
+
+
+@st.cache_resource
+def get_ollama_monitor():
+    """OllamaMonitor tunggal untuk semua session (dibuat sekali per process)"""
+    return OllamaMonitor()
+
+
+# Cache response model
+def normalize_prompt(text):
+    """Normalisasi prompt untuk key cache: lowercase, spasi dirapikan, tanda baca di ujung dibuang"""
+    return " ".join(text.lower().split()).strip(" ?!.")
+
+
+class ResponseCache:
+    """
+    Cache response model dengan LRU eviction, disimpan sebagai JSON di disk
+
+    Key: model, options, history sebelum prompt, dan prompt yang sudah
+    dinormalisasi. Jika similarity diset, prompt dengan history, model, dan
+    options yang sama juga dicocokkan dengan cosine similarity TF-IDF.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_FILE, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 similarity=RESPONSE_CACHE_SIMILARITY):
+        self.path = path
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._vectors = {}
+        self._df = Counter()
+        self._load()
+
+    @staticmethod
+    def _scope(context, model, options):
+        """Digest model, options, dan history sebelum prompt"""
+        payload = json.dumps(
+            [model, options, [[m["role"], m["content"]] for m in context[:-1]]],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _terms(prompt):
+        return Counter(re.findall(r"\w+", prompt))
+
+    def _index(self, key, entry):
+        terms = self._terms(entry["prompt"])
+        self._vectors[key] = terms
+        self._df.update(terms.keys())
+
+    def _unindex(self, key):
+        self._df.subtract(self._vectors.pop(key).keys())
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        for key, entry in entries[-self.max_entries:]:
+            self._entries[key] = entry
+            self._index(key, entry)
+
+    def _save(self):
+        """Tulis ke file sementara lalu os.replace (atomic)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(list(self._entries.items()), f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def _cosine(self, a, b):
+        n = len(self._entries)
+        weight = lambda term: math.log((n + 1) / (self._df[term] + 1)) + 1
+        dot = sum(a[t] * b[t] * weight(t) ** 2 for t in a.keys() & b.keys())
+        norm_a = math.sqrt(sum((c * weight(t)) ** 2 for t, c in a.items()))
+        norm_b = math.sqrt(sum((c * weight(t)) ** 2 for t, c in b.items()))
+        return dot / (norm_a * norm_b) if norm_a and norm_b else 0.0
+
+    def get(self, context, model=MODEL, options=OLLAMA_OPTIONS):
+        """
+        Cari response untuk context percakapan
+
+        Args:
+            context (list): Context dari build_context, pesan terakhir adalah prompt
+            model (str): Nama model
+            options (dict): Options generate
+
+        Returns:
+            tuple: Response dan jenis match ('exact' atau 'similar'), atau None
+        """
+        scope = self._scope(context, model, options)
+        prompt = normalize_prompt(context[-1]["content"])
+        key = hashlib.sha256(f"{scope}:{prompt}".encode("utf-8")).hexdigest()
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]["response"], "exact"
+
+            if self.similarity is None:
+                return None
+            terms = self._terms(prompt)
+            best, best_score = None, self.similarity
+            for other, entry in self._entries.items():
+                if entry["scope"] != scope:
+                    continue
+                score = self._cosine(terms, self._vectors[other])
+                if score >= best_score:
+                    best, best_score = other, score
+            if best is None:
+                return None
+            self._entries.move_to_end(best)
+            return self._entries[best]["response"], "similar"
+
+    def put(self, context, response, model=MODEL, options=OLLAMA_OPTIONS):
+        """Simpan response, entry yang paling lama tidak dipakai dibuang jika penuh"""
+        scope = self._scope(context, model, options)
+        prompt = normalize_prompt(context[-1]["content"])
+        key = hashlib.sha256(f"{scope}:{prompt}".encode("utf-8")).hexdigest()
+
+        with self._lock:
+            if key in self._entries:
+                self._unindex(key)
+            self._entries[key] = {"scope": scope, "prompt": prompt, "response": response}
+            self._entries.move_to_end(key)
+            self._index(key, self._entries[key])
+            while len(self._entries) > self.max_entries:
+                oldest, _ = self._entries.popitem(last=False)
+                self._unindex(oldest)
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._vectors.clear()
+            self._df.clear()
+            self._save()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+@st.cache_resource
+def get_response_cache():
+    """ResponseCache tunggal untuk semua session"""
+    return ResponseCache()
+
+
+@st.cache_resource
+def get_scheduler():
+    """RequestScheduler tunggal untuk semua session"""
+    return RequestScheduler(
+        max_concurrency=SCHEDULER_MAX_CONCURRENCY,
+        max_queue=SCHEDULER_MAX_QUEUE
+    )
+
+
+# Function untuk mengirim request lewat scheduler
+def submit_request(func, *args):
+    """
+    Masukkan request ke scheduler atas nama session ini
+
+    Request dibatalkan otomatis jika session sudah tidak aktif (tab ditutup).
+
+    Returns:
+        Ticket: Request di antrian scheduler
+    """
+    session_id = get_script_run_ctx().session_id
+    return get_scheduler().submit(
+        session_id, func, *args,
+        is_alive=lambda: runtime.get_instance().is_active_session(session_id)
+    )
+
+
+# Function untuk menunggu giliran di antrian
+def wait_in_queue(ticket):
+    """
+    Tunggu sampai request dijalankan, posisi antrian ditampilkan selama menunggu
+
+    Args:
+        ticket (Ticket): Request dari submit_request
+    """
+    placeholder = st.empty()
+    try:
+        while not ticket.wait_started(timeout=0.5) and not ticket.cancelled:
+            position = ticket.position()
+            if position:
+                placeholder.caption(f"Posisi antrian: {position}")
+    except BaseException:
+        # Script dihentikan (rerun/clear chat) selama menunggu
+        ticket.cancel()
+        raise
+    placeholder.empty()
+
+
 # Function cek koneksi model Ollama
 def check_ollama_connection():
     """
-    Fungsi untuk mengecek koneksi model Ollama
+    Fungsi untuk mengecek koneksi model Ollama (dari status cache, tanpa request)
+
+    Returns:
+        tuple: Status koneksi ke Ollama (bool) dan pesan status
+    """
+    status = get_ollama_monitor().status()
+    return status["connected"], status["message"]
+
+
+# Function estimasi jumlah token
+def count_tokens(message):
+    """
+    Estimasi jumlah token satu pesan, disimpan di pesan agar tidak dihitung ulang
+
+    Args:
+        message (dict): Pesan di session_state.messages
+
+    Returns:
+        int: Estimasi jumlah token
+    """
+    if "tokens" not in message:
+        message["tokens"] = len(message["content"]) // CHARS_PER_TOKEN + 1
+    return message["tokens"]
+
+
+# Function untuk menyusun context percakapan
+def build_context(messages, budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Pilih pesan terbaru yang muat di budget token
+
+    Pesan terakhir (prompt user) selalu disertakan. Turn yang lebih lama di-drop,
+    atau diganti ringkasan jika CONTEXT_SUMMARIZE aktif.
+
+    Args:
+        messages (list): History chat (session_state.messages), pesan terakhir
+            adalah prompt user
+        budget (int): Budget token untuk context
+
+    Returns:
+        list: Pesan untuk ollama.chat (role, content)
+    """
+    start = len(messages) - 1
+    used = count_tokens(messages[start])
+    while start > 0 and used + count_tokens(messages[start - 1]) <= budget:
+        start -= 1
+        used += count_tokens(messages[start])
+    
+    # Context dimulai dari pesan user
+    while start < len(messages) - 1 and messages[start]["role"] != "user":
+        start += 1
+    
+    context = [{"role": m["role"], "content": m["content"]} for m in messages[start:]]
+    if CONTEXT_SUMMARIZE and start > 0:
+        summary = summarize_history(messages[:start])
+        if summary:
+            context.insert(0, {
+                "role": "system",
+                "content": f"Ringkasan percakapan sebelumnya: {summary}"
+            })
+    return context
+
+
+# Function untuk meringkas turn lama
+def summarize_history(messages):
+    """
+    Ringkasan pesan lama, di-update bertahap (hanya pesan yang baru keluar dari
+    window yang diringkas bersama ringkasan sebelumnya)
+
+    Args:
+        messages (list): Pesan yang tidak muat di budget
 
     Returns:
-        boolena: Status koneksi ke Ollama
+        str: Ringkasan, atau None jika gagal
     """
+    cached = st.session_state.get("context_summary")
+    if cached and cached["upto"] == len(messages):
+        return cached["content"]
+    
+    covered = cached["upto"] if cached and cached["upto"] < len(messages) else 0
+    previous = cached["content"] if covered else ""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages[covered:])
+    prompt = (
+        "Ringkas percakapan berikut dalam beberapa kalimat singkat.\n"
+        f"{('Ringkasan sebelumnya: ' + previous) if previous else ''}\n"
+        f"{transcript}"
+    )
     try:
-        ollama.list()
-        return True, "Ollama service running"
-    except Exception as e:
-        return False, f"Ollama service error: {str(e)}"
+        # Lewat scheduler seperti request chat (antrian, concurrency, pembatalan)
+        ticket = submit_request(request_summary, prompt)
+        wait_in_queue(ticket)
+        summary = ticket.result()
+    except (QueueFull, Cancelled, requests.RequestException,
+            ollama.ResponseError, httpx.HTTPError):
+        # Antrian penuh, dibatalkan, atau error request ke Ollama (client ollama
+        # memakai httpx): pakai ringkasan sebelumnya, error lain tetap di-raise
+        return previous or None
+    
+    st.session_state.context_summary = {"upto": len(messages), "content": summary}
+    return summary
+
+
+def request_summary(prompt):
+    """Request ringkasan ke model (dijalankan worker scheduler)"""
+    response = ollama.chat(
+        model=MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        options=OLLAMA_OPTIONS,
+    )
+    return response['message']['content']
 
 
 # Function untuk mendapatkan response dari model
-def get_ollama_response(prompt):
+def get_ollama_response(messages):
     """
-    Fungsi ini digunakan untuk mengirim prompt dan mendapatkan response dari model
+    Fungsi ini digunakan untuk mengirim percakapan dan mendapatkan response dari model
 
     Args:
-        prompt (str): Prompt dari user
+        messages (list): Context percakapan dari build_context
 
     Returns:
         str: Response dari model
     """
     
-    model="gemma3:1b"
+    model=MODEL
     try:
         # Options dari model Ollama
         response = ollama.chat(
             model=model,
-            messages=[
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
+            options=OLLAMA_OPTIONS,
         )
         return response['message']['content'], None
     except Exception as e:
         return None, f"Error: {str(e)}"
 
 
+# Function untuk streaming response dari model
+def stream_ollama_response(messages, stats):
+    """
+    Generator untuk streaming response dari model (chat API dengan stream=True)
+
+    Args:
+        messages (list): Context percakapan dari build_context
+        stats (dict): Diisi dengan statistik generate: ttft (detik sampai
+            token pertama), tokens, tokens_per_sec, prompt_tokens, total_time
+
+    Yields:
+        str: Potongan teks response
+    """
+    start = time.perf_counter()
+    stream = ollama.chat(
+        model=MODEL,
+        messages=messages,
+        options=OLLAMA_OPTIONS,
+        stream=True,
+    )
+    
+    chunks = 0
+    for chunk in stream:
+        content = chunk['message']['content']
+        if content:
+            if "ttft" not in stats:
+                stats["ttft"] = time.perf_counter() - start
+            chunks += 1
+            yield content
+        
+        if chunk.get('done'):
+            # Statistik dari Ollama (durasi dalam nanodetik)
+            if chunk.get('prompt_eval_count'):
+                stats["prompt_tokens"] = chunk['prompt_eval_count']
+            if chunk.get('eval_count') and chunk.get('eval_duration'):
+                stats["tokens"] = chunk['eval_count']
+                stats["tokens_per_sec"] = chunk['eval_count'] / (chunk['eval_duration'] / 1e9)
+    
+    stats["total_time"] = time.perf_counter() - start
+    if "tokens_per_sec" not in stats and chunks:
+        # Fallback: satu chunk stream kira-kira satu token
+        stats["tokens"] = chunks
+        stats["tokens_per_sec"] = chunks / max(stats["total_time"] - stats.get("ttft", 0), 1e-9)
+
+
+def format_caption(message):
+    """
+    Caption di bawah pesan: timestamp dan statistik generate (jika ada)
+
+    Args:
+        message (dict): Pesan di session_state.messages
+
+    Returns:
+        str: Teks caption
+    """
+    caption = message["timestamp"]
+    if message.get("cache"):
+        caption += f" · cache hit ({message['cache']})"
+    stats = message.get("stats")
+    if stats and stats.get("queue_wait", 0) >= 0.5:
+        caption += f" · antrian {stats['queue_wait']:.1f}s"
+    if stats and "ttft" in stats:
+        caption += f" · TTFT {stats['ttft']:.2f}s"
+    if stats and "tokens_per_sec" in stats:
+        caption += f" · {stats['tokens_per_sec']:.1f} tokens/s"
+    return caption
+
+
 # Header aplikasi
 st.title("Ollama Chat Interface")
 st.markdown("### (Menggunakan Model Gemma3:1b)")
@@ -61,7 +524,7 @@ st.markdown("### (Menggunakan Model Gemma3:1b)")
 for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
-        st.caption(message["timestamp"])
+        st.caption(format_caption(message))
 
 # Input chat dari user
 if prompt := st.chat_input("Ketik pertanyaan Anda di sini..."):
@@ -80,26 +543,67 @@ if prompt := st.chat_input("Ketik pertanyaan Anda di sini..."):
     
     # Dapatkan dan tampilkan response dari model
     with st.chat_message("assistant"):
-        with st.spinner("Mohon menunggu, Ollama sedang berpikir..."):
-            response, error = get_ollama_response(
-                prompt,
-            )
-            
-            if error:
-                st.error(error)
-                if "model" in error.lower():
-                    st.info("Jalankan model Ollama: `ollama pull gemma3:1b`")
-            else:
-                st.markdown(response)
-                response_timestamp = datetime.now().strftime("%H:%M:%S")
-                st.caption(response_timestamp)
+        stats = {}
+        with st.spinner("Menyiapkan context percakapan..."):
+            context = build_context(st.session_state.messages)
+        cache = get_response_cache() if RESPONSE_CACHE_ENABLED else None
+        hit = cache.get(context) if cache else None
+        if hit:
+            # Response dari cache, tanpa generate ulang
+            response, error = hit[0], None
+            st.markdown(response)
+        else:
+            try:
+                with st.spinner("Mohon menunggu, Ollama sedang berpikir..."):
+                    if STREAM_RESPONSES:
+                        ticket = submit_request(stream_ollama_response, context, stats)
+                        wait_in_queue(ticket)
+                        stream = ticket.stream()
+                        first_chunk = next(stream, "")
+                    else:
+                        ticket = submit_request(get_ollama_response, context)
+                        wait_in_queue(ticket)
+                        response, error = ticket.result()
+                stats["queue_wait"] = ticket.queue_wait
                 
-                # Tambahkan response model ke history
-                st.session_state.messages.append({
-                    "role": "assistant",
-                    "content": response,
-                    "timestamp": response_timestamp
-                })
+                if STREAM_RESPONSES:
+                    # Token ditampilkan langsung saat di-generate
+                    def chunks():
+                        yield first_chunk
+                        yield from stream
+                    
+                    try:
+                        response = st.write_stream(chunks())
+                    finally:
+                        # Stream yang berhenti di tengah (rerun/clear chat) membatalkan request
+                        stream.close()
+                    error = None
+                elif not error:
+                    st.markdown(response)
+            except QueueFull:
+                response, error = None, "Server sedang sibuk, coba lagi beberapa saat lagi"
+            except Cancelled:
+                response, error = None, "Request dibatalkan"
+            except Exception as e:
+                response, error = None, f"Error: {str(e)}"
+        
+        if error:
+            st.error(error)
+            if "model" in error.lower():
+                st.info(f"Jalankan model Ollama: `ollama pull {MODEL}`")
+        else:
+            # Tambahkan response model ke history
+            message = {
+                "role": "assistant",
+                "content": response,
+                "timestamp": datetime.now().strftime("%H:%M:%S"),
+                "stats": stats,
+                "cache": hit[1] if hit else None
+            }
+            if cache and not hit and response:
+                cache.put(context, response)
+            st.caption(format_caption(message))
+            st.session_state.messages.append(message)
 
 # Sidebar
 with st.sidebar:
@@ -118,11 +622,33 @@ with st.sidebar:
         """)
         st.stop()
     
+    # Daftar model dari status cache
+    status = get_ollama_monitor().status()
+    st.markdown("### Model:")
+    for name in status["models"]:
+        state = "loaded" if name in status["loaded"] else "available"
+        active = " (aktif)" if name == MODEL else ""
+        st.markdown(f"- `{name}`{active} — {state}")
+    if MODEL not in status["models"]:
+        st.warning(f"Model {MODEL} belum tersedia: `ollama pull {MODEL}`")
+    st.caption(f"Dicek: {status['checked_at']}")
+    if st.button("Refresh Status", use_container_width=True):
+        get_ollama_monitor().refresh()
+        st.rerun()
+    
     st.markdown("---")
     
     # Button untuk clear chat history
     if st.button("Clear Chat History", use_container_width=True):
+        # Batalkan request session ini yang masih di antrian/berjalan
+        get_scheduler().cancel_session(get_script_run_ctx().session_id)
         st.session_state.messages = []
+        st.session_state.pop("context_summary", None)
         st.rerun()
-        
+    
+    # Button untuk clear cache response
+    if RESPONSE_CACHE_ENABLED:
+        if st.button(f"Clear Response Cache ({len(get_response_cache())})", use_container_width=True):
+            get_response_cache().clear()
+            st.rerun()
     
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Modul untuk scheduler request ke Ollama yang dipakai bersama semua session
+
+Request dari semua session Streamlit masuk ke satu antrian terbatas dan
+dijalankan oleh worker thread sebanyak batas concurrency (disamakan dengan
+OLLAMA_NUM_PARALLEL di server). Antrian diambil bergiliran per session
+(round-robin), sehingga satu session yang mengirim banyak request tidak
+membuat session lain menunggu lama.
+
+Contoh:
+    scheduler = RequestScheduler(max_concurrency=1)
+    ticket = scheduler.submit(session_id, stream_fn, prompt)
+    for chunk in ticket.stream():
+        ...
+"""
+
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+_DONE = object()
+
+
+class QueueFull(Exception):
+    """Antrian scheduler sudah penuh"""
+
+
+class Cancelled(Exception):
+    """Request dibatalkan sebelum selesai"""
+
+
+class Ticket:
+    """Satu request di scheduler: posisi antrian, hasil (stream), dan pembatalan"""
+
+    def __init__(self, scheduler, session_id, func, args, is_alive):
+        self.scheduler = scheduler
+        self.session_id = session_id
+        self.func = func
+        self.args = args
+        self.is_alive = is_alive
+        self.submitted_at = time.perf_counter()
+        self.started_at = None
+        self._started = threading.Event()
+        self._cancelled = threading.Event()
+        self._chunks = queue.Queue()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def queue_wait(self):
+        """Lama menunggu di antrian (detik)"""
+        end = self.started_at if self.started_at is not None else time.perf_counter()
+        return end - self.submitted_at
+
+    def position(self):
+        """
+        Posisi di antrian
+
+        Returns:
+            int: 1 = request berikutnya yang dijalankan, 0 = sedang/sudah dijalankan
+        """
+        return self.scheduler.position(self)
+
+    def wait_started(self, timeout=None):
+        """Tunggu sampai request mulai dijalankan worker"""
+        return self._started.wait(timeout)
+
+    def cancel(self):
+        """Batalkan request: dikeluarkan dari antrian, atau stream dihentikan"""
+        if not self._cancelled.is_set():
+            self._cancelled.set()
+            self.scheduler._remove(self)
+            self._chunks.put(_DONE)
+
+    def stream(self):
+        """
+        Hasil request sebagai stream
+
+        Jika generator ini ditutup sebelum selesai (mis. script Streamlit
+        dihentikan), request ikut dibatalkan.
+
+        Yields:
+            Item dari func (satu item jika func tidak mengembalikan iterator)
+
+        Raises:
+            Cancelled: Jika request dibatalkan
+            Exception: Error dari func
+        """
+        finished = False
+        try:
+            while True:
+                item = self._chunks.get()
+                if item is _DONE:
+                    finished = True
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            if not finished:
+                self.cancel()
+        if self.cancelled:
+            raise Cancelled()
+
+    def result(self):
+        """Hasil request yang tidak di-stream (item pertama dari stream)"""
+        items = list(self.stream())
+        return items[0] if items else None
+
+
+class RequestScheduler:
+    """
+    Antrian request terbatas dengan fairness per session dan batas concurrency
+
+    Args:
+        max_concurrency (int): Jumlah request yang berjalan bersamaan
+        max_queue (int): Jumlah maksimal request yang menunggu (semua session)
+        max_per_session (int): Jumlah maksimal request menunggu per session
+    """
+
+    def __init__(self, max_concurrency=1, max_queue=32, max_per_session=4):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_per_session = max_per_session
+        self._pending = OrderedDict()  # session_id -> deque of Ticket
+        self._running = set()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+        for i in range(max_concurrency):
+            threading.Thread(target=self._worker, name=f"ollama-worker-{i}", daemon=True).start()
+
+    def submit(self, session_id, func, *args, is_alive=None):
+        """
+        Masukkan request ke antrian
+
+        Args:
+            session_id (str): Id session pengirim (unit fairness dan pembatalan)
+            func (callable): Dijalankan worker dengan *args; jika mengembalikan
+                iterator, item-nya diteruskan satu per satu (streaming)
+            is_alive (callable): Opsional, False jika pengirim sudah tidak aktif
+                (request dibatalkan sebelum atau selama dijalankan)
+
+        Returns:
+            Ticket
+
+        Raises:
+            QueueFull: Jika antrian penuh
+        """
+        ticket = Ticket(self, session_id, func, args, is_alive)
+        with self._lock:
+            pending = self._pending_count()
+            if pending >= self.max_queue or len(self._pending.get(session_id, ())) >= self.max_per_session:
+                raise QueueFull(f"Antrian penuh ({pending} request menunggu)")
+            self._pending.setdefault(session_id, deque()).append(ticket)
+            self._available.notify()
+        return ticket
+
+    def pending(self):
+        """Jumlah request yang menunggu"""
+        with self._lock:
+            return self._pending_count()
+
+    def _pending_count(self):
+        return sum(len(tickets) for tickets in self._pending.values())
+
+    def running(self):
+        """Jumlah request yang sedang dijalankan"""
+        return len(self._running)
+
+    def position(self, ticket):
+        """Posisi ticket di antrian dengan urutan round-robin (0 jika tidak menunggu)"""
+        with self._lock:
+            order = self._dispatch_order()
+        try:
+            return order.index(ticket) + 1
+        except ValueError:
+            return 0
+
+    def cancel_session(self, session_id):
+        """Batalkan semua request session (menunggu maupun berjalan)"""
+        with self._lock:
+            tickets = list(self._pending.get(session_id, ()))
+            tickets += [t for t in self._running if t.session_id == session_id]
+        for ticket in tickets:
+            ticket.cancel()
+
+    def _dispatch_order(self):
+        """Urutan request menunggu yang akan dijalankan (round-robin antar session)"""
+        queues = [list(tickets) for tickets in self._pending.values()]
+        order = []
+        for i in range(max(map(len, queues), default=0)):
+            order.extend(tickets[i] for tickets in queues if i < len(tickets))
+        return order
+
+    def _remove(self, ticket):
+        with self._lock:
+            tickets = self._pending.get(ticket.session_id)
+            if tickets and ticket in tickets:
+                tickets.remove(ticket)
+                if not tickets:
+                    del self._pending[ticket.session_id]
+
+    def _next(self):
+        """Ambil request berikutnya; session yang dilayani pindah ke belakang giliran"""
+        with self._lock:
+            while True:
+                while self._pending:
+                    session_id, tickets = next(iter(self._pending.items()))
+                    ticket = tickets.popleft()
+                    if tickets:
+                        self._pending.move_to_end(session_id)
+                    else:
+                        del self._pending[session_id]
+                    if ticket.is_alive is not None and not ticket.is_alive():
+                        ticket._cancelled.set()
+                        ticket._chunks.put(_DONE)
+                        continue
+                    self._running.add(ticket)
+                    return ticket
+                self._available.wait()
+
+    def _worker(self):
+        while True:
+            ticket = self._next()
+            ticket.started_at = time.perf_counter()
+            ticket._started.set()
+            try:
+                self._run(ticket)
+            finally:
+                with self._lock:
+                    self._running.discard(ticket)
+
+    def _run(self, ticket):
+        result = None
+        try:
+            result = ticket.func(*ticket.args)
+            if not hasattr(result, '__next__'):
+                ticket._chunks.put(result)
+                return
+            for item in result:
+                if ticket.cancelled or (ticket.is_alive is not None and not ticket.is_alive()):
+                    ticket._cancelled.set()
+                    break
+                ticket._chunks.put(item)
+        except Exception as e:
+            ticket._chunks.put(e)
+        finally:
+            if hasattr(result, 'close'):
+                # Menutup stream Ollama juga menghentikan generate di server
+                result.close()
+            ticket._chunks.put(_DONE)